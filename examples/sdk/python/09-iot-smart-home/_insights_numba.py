@@ -0,0 +1,58 @@
+"""
+Bulk confidence scoring for learned patterns.
+
+A real hub scores far more observations than this example does, so the
+per-item work (rounding to a percentage, comparing against the approval
+threshold) is written once over arrays. Numba compiles it to native code
+when installed; otherwise NumPy runs the same expressions, and without
+NumPy a plain Python loop is used. Every backend returns plain lists.
+"""
+
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to Python
+    np = None
+
+try:
+    import numba
+
+    _HAS_NUMBA = True
+except ImportError:  # Numba is optional; fall back to NumPy
+    _HAS_NUMBA = False
+
+
+# Below this many items the array conversion costs more than it saves
+VECTORIZE_MIN = 32
+
+
+def _pct_round_array(c):
+    return np.rint(c * 100.0).astype(np.int32)
+
+
+def _select_array(c, thr):
+    return c >= thr
+
+
+if _HAS_NUMBA:
+    _pct_round_array = numba.njit(cache=True, nogil=True)(_pct_round_array)
+    _select_array = numba.njit(cache=True, nogil=True)(_select_array)
+
+
+def _vectorize(confidences: Sequence[float]) -> bool:
+    return np is not None and len(confidences) >= VECTORIZE_MIN
+
+
+def pct_round(confidences: Sequence[float]) -> list[int]:
+    """Return each confidence as a whole percentage (round half to even)."""
+    if _vectorize(confidences):
+        return _pct_round_array(np.asarray(confidences, dtype=np.float64)).tolist()
+    return [round(c * 100) for c in confidences]
+
+
+def select_high_confidence(confidences: Sequence[float], threshold: float) -> list[bool]:
+    """Return, per confidence, whether it meets ``threshold``."""
+    if _vectorize(confidences):
+        return _select_array(np.asarray(confidences, dtype=np.float64), threshold).tolist()
+    return [c >= threshold for c in confidences]
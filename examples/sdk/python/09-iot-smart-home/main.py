@@ -12,289 +12,378 @@ Scenario: A smart home hub uses a2p to:
 """
 
 import asyncio
+import sys
+from dataclasses import dataclass, field
+
 from a2p import (
     create_user_client,
     create_agent_client,
-    add_policy,
+    add_consent_policy,
+    ConsentPolicy,
     PermissionLevel,
     MemoryStorage,
+    AsyncBatchingStorage,
+    generate_policy_id,
 )
 
+from _insights_numba import pct_round, select_high_confidence
 
-storage = MemoryStorage()
 
+storage = AsyncBatchingStorage(MemoryStorage())
 
-async def main():
-    print("🚀 a2p Example: IoT Smart Home\n")
-    print("═══════════════════════════════════════════════════════════\n")
-    print("   This example demonstrates a2p with IoT devices,")
-    print("   showing the protocol works BEYOND just AI agents.\n")
-    print("═══════════════════════════════════════════════════════════\n")
 
-    # ============================================
-    # 1. Setup User Profile with Home Preferences
-    # ============================================
-    print("👤 Step 1: Setting up user profile with home preferences...\n")
+# Proposals at or above this confidence are approved automatically
+APPROVAL_THRESHOLD = 0.8
 
-    user = create_user_client(storage)
-    profile = await user.create_profile(display_name="Alex")
 
-    # Add existing home preferences
-    await user.add_memory(
-        content="Preferred temperature: 21°C (70°F) during the day",
-        category="a2p:preferences.environment",
-    )
+# Consent policy for smart home services, built once and attached to each new profile
+HOME_POLICY = ConsentPolicy(
+    id=generate_policy_id(),
+    name="Smart Home Devices",
+    agent_pattern="did:a2p:service:local:iot-*",
+    permissions=[PermissionLevel.READ_SCOPED, PermissionLevel.PROPOSE],
+    allow=["a2p:preferences.environment.*", "a2p:preferences.lighting.*", "a2p:routines.*"],
+    deny=["a2p:health.*", "a2p:financial.*", "a2p:professional.*"],
+)
 
-    await user.add_memory(
-        content="Prefers dimmed warm lighting in the evening",
-        category="a2p:preferences.lighting",
-    )
 
-    await user.add_memory(
-        content="Usually wakes up around 7:00am on weekdays",
-        category="a2p:routines.schedule",
-    )
-
-    await user.add_memory(
-        content="Works from home on Mondays and Fridays",
-        category="a2p:routines.work",
-    )
-
-    # Add policy for smart home services
-    current_profile = user.get_profile()
-    current_profile = add_policy(
-        current_profile,
-        name="Smart Home Devices",
-        agent_pattern="did:a2p:service:local:iot-*",
-        permissions=[PermissionLevel.READ_SCOPED, PermissionLevel.PROPOSE],
-        allow=["a2p:preferences.environment.*", "a2p:preferences.lighting.*", "a2p:routines.*"],
-        deny=["a2p:health.*", "a2p:financial.*", "a2p:professional.*"],
-    )
-
-    await storage.set(profile.id, current_profile)
-    print(f"   ✅ Profile created: {profile.id}")
-    print("   ✅ Home preferences added")
-    print("   ✅ Consent policy for IoT services configured\n")
-
-    # ============================================
-    # 2. Smart Home Hub Reads Profile
-    # ============================================
-    print("🏠 Step 2: Smart Home Hub reading user profile...\n")
-
-    # The smart home hub is a "service" not an "agent" — same protocol!
-    smart_home = create_agent_client(
-        agent_did="did:a2p:service:local:iot-homewise",
-        storage=storage
-    )
-
-    user_profile = await smart_home.get_profile(
-        user_did=profile.id,
-        scopes=["a2p:preferences", "a2p:routines"],
-    )
-
-    print("   📋 Retrieved preferences from a2p profile:")
-    memories = user_profile.memories.episodic if user_profile.memories else []
-    for memory in memories:
-        print(f"      • {memory.content}")
-    print()
-
-    # ============================================
-    # 3. Apply Personalized Automation
-    # ============================================
-    print("⚡ Step 3: Applying personalized automation...\n")
-
-    print("   🌡️  Thermostat → Set to 21°C (from profile)")
-    print("   💡 Living Room → Warm dimmed lights (evening mode)")
-    print("   ⏰ Wake routine → Scheduled for 7:00am weekdays")
-    print("   🏢 Work mode → Home office setup for Mon/Fri\n")
-
-    # Simulate devices responding to preferences
-    device_actions = [
-        {"device": "Thermostat", "action": "Set to 21°C", "room": "Whole house"},
-        {"device": "Smart Lights", "action": "Warm white, 40% brightness", "room": "Living Room"},
-        {"device": "Smart Blinds", "action": "Partially closed", "room": "Bedroom"},
-        {"device": "Coffee Maker", "action": "Scheduled for 6:55am", "room": "Kitchen"},
-    ]
-
-    print("   📱 Device actions executed:")
-    for action in device_actions:
-        print(f"      • {action['device']} ({action['room']}): {action['action']}")
-    print()
-
-    # ============================================
-    # 4. Learn Patterns from Sensors (Simulated)
-    # ============================================
-    print("📊 Step 4: Learning patterns from sensor data...\n")
-
-    print("   📈 Pattern analysis over 4 weeks:\n")
-
-    patterns = [
-        {
-            "pattern": "Arrives home around 6:30pm on weekdays",
-            "confidence": 0.88,
-            "source": "Door lock + motion sensors",
-        },
-        {
-            "pattern": "Lowers thermostat to 18°C before sleep (around 11pm)",
-            "confidence": 0.82,
-            "source": "Thermostat adjustments",
-        },
-        {
-            "pattern": "Prefers all lights off after midnight",
-            "confidence": 0.9,
-            "source": "Light switch patterns",
-        },
-        {
-            "pattern": "Uses kitchen heavily 7-8am and 7-8pm",
-            "confidence": 0.85,
-            "source": "Motion + appliance sensors",
-        },
-        {
-            "pattern": "Opens bedroom blinds immediately after waking",
-            "confidence": 0.75,
-            "source": "Blind motor + motion correlation",
-        },
-    ]
-
-    for p in patterns:
-        print(f"      • {p['pattern']}")
-        print(f"        └─ Source: {p['source']} ({round(p['confidence'] * 100)}% confidence)")
-    print()
-
-    # ============================================
-    # 5. Propose Learned Routines to Profile
-    # ============================================
-    print("💡 Step 5: Proposing learned routines to user profile...\n")
-
-    await smart_home.propose_memory(
-        user_did=profile.id,
+@dataclass(slots=True, frozen=True)
+class DeviceAction:
+    device: str
+    action: str
+    room: str
+
+
+@dataclass(slots=True, frozen=True)
+class Pattern:
+    pattern: str
+    confidence: float
+    source: str
+    confidence_pct: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "confidence_pct", round(self.confidence * 100))
+
+
+@dataclass(slots=True, frozen=True)
+class ProposalSpec:
+    label: str
+    content: str
+    category: str
+    confidence: float
+    context: str
+    confidence_pct: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "confidence_pct", round(self.confidence * 100))
+
+
+# Simulated devices responding to preferences
+DEVICE_ACTIONS: tuple[DeviceAction, ...] = (
+    DeviceAction("Thermostat", "Set to 21°C", "Whole house"),
+    DeviceAction("Smart Lights", "Warm white, 40% brightness", "Living Room"),
+    DeviceAction("Smart Blinds", "Partially closed", "Bedroom"),
+    DeviceAction("Coffee Maker", "Scheduled for 6:55am", "Kitchen"),
+)
+
+PATTERNS: tuple[Pattern, ...] = (
+    Pattern("Arrives home around 6:30pm on weekdays", 0.88, "Door lock + motion sensors"),
+    Pattern(
+        "Lowers thermostat to 18°C before sleep (around 11pm)", 0.82, "Thermostat adjustments"
+    ),
+    Pattern("Prefers all lights off after midnight", 0.9, "Light switch patterns"),
+    Pattern("Uses kitchen heavily 7-8am and 7-8pm", 0.85, "Motion + appliance sensors"),
+    Pattern(
+        "Opens bedroom blinds immediately after waking", 0.75, "Blind motor + motion correlation"
+    ),
+)
+
+PROPOSALS: tuple[ProposalSpec, ...] = (
+    ProposalSpec(
+        label="Arrival time routine",
         content="Usually arrives home around 6:30pm on weekdays",
         category="a2p:routines.schedule",
         confidence=0.88,
         context="Based on 4 weeks of door lock and motion sensor data",
-    )
-    print("   📝 Proposed: Arrival time routine (88% confidence)")
-
-    await smart_home.propose_memory(
-        user_did=profile.id,
+    ),
+    ProposalSpec(
+        label="Sleep temperature preference",
         content="Preferred sleep temperature: 18°C (64°F)",
         category="a2p:preferences.environment",
         confidence=0.82,
         context="Consistent thermostat lowering before 11pm bedtime",
-    )
-    print("   📝 Proposed: Sleep temperature preference (82% confidence)")
-
-    await smart_home.propose_memory(
-        user_did=profile.id,
+    ),
+    ProposalSpec(
+        label="Dark sleep preference",
         content="Prefers complete darkness for sleeping (all lights off after midnight)",
         category="a2p:preferences.lighting",
         confidence=0.9,
         context="Consistent pattern: 100% lights-off after 12am",
-    )
-    print("   📝 Proposed: Dark sleep preference (90% confidence)")
-
-    await smart_home.propose_memory(
-        user_did=profile.id,
+    ),
+    ProposalSpec(
+        label="Morning blinds routine",
         content="Morning routine: Opens blinds immediately after waking",
         category="a2p:routines.morning",
         confidence=0.75,
         context="Blind motor activation correlates with first motion detection",
-    )
-    print("   📝 Proposed: Morning blinds routine (75% confidence)\n")
-
-    # ============================================
-    # 6. Cross-Device/Service Benefits
-    # ============================================
-    print("🔗 Step 6: Cross-Device & Cross-Service Benefits\n")
-    print("   Once Alex approves these proposals, OTHER services benefit:\n")
-    print("   ┌────────────────────────────────────────────────────────────┐")
-    print("   │                                                            │")
-    print("   │  🚗 Connected car  → Pre-heat home when leaving work      │")
-    print("   │  ⌚ Smartwatch     → Adjust based on sleep patterns       │")
-    print("   │  🤖 AI assistant   → Suggest \"heading home?\" at 6pm       │")
-    print("   │  🏨 Hotel apps     → Apply temperature preferences        │")
-    print("   │  📱 Other IoT hubs → Sync routines across locations       │")
-    print("   │  🎵 Music service  → Queue relaxing music at 10:30pm      │")
-    print("   │                                                            │")
-    print("   └────────────────────────────────────────────────────────────┘\n")
-    print("   This is the power of USER-OWNED profiles:")
-    print("   → IoT learnings benefit your entire digital ecosystem.\n")
-
-    # ============================================
-    # 7. User Reviews Proposals
-    # ============================================
-    print("👤 Step 7: Alex reviews and manages proposals...\n")
-
-    await user.load_profile(profile.id)
-    proposals = user.get_pending_proposals()
-
-    approved = 0
-    rejected = 0
-
-    for proposal in proposals:
-        print(f'   📝 "{proposal.memory.content}"')
-        print(f"      From: {proposal.proposed_by.agent_did}")
-        print(f"      Confidence: {round((proposal.memory.confidence or 0) * 100)}%")
+    ),
+)
+
+
+# Row templates, bound once; fields are read off the dataclass instances
+_DEVICE_FMT = "      • {0.device} ({0.room}): {0.action}".format
+_PATTERN_FMT = (
+    "      • {0.pattern}\n        └─ Source: {0.source} ({0.confidence_pct}% confidence)"
+).format
+_PROPOSED_FMT = "   📝 Proposed: {0.label} ({0.confidence_pct}% confidence)".format
+_PROPOSAL_FMT = '   📝 "{c}"\n      From: {d}\n      Confidence: {p}%\n'.format
+
+
+HEADER_09 = """\
+🚀 a2p Example: IoT Smart Home
+
+═══════════════════════════════════════════════════════════
+
+   This example demonstrates a2p with IoT devices,
+   showing the protocol works BEYOND just AI agents.
+
+═══════════════════════════════════════════════════════════
+
+"""
+
+CROSS_SERVICE_09 = """\
+🔗 Step 6: Cross-Device & Cross-Service Benefits
+
+   Once Alex approves these proposals, OTHER services benefit:
+
+   ┌────────────────────────────────────────────────────────────┐
+   │                                                            │
+   │  🚗 Connected car  → Pre-heat home when leaving work      │
+   │  ⌚ Smartwatch     → Adjust based on sleep patterns       │
+   │  🤖 AI assistant   → Suggest "heading home?" at 6pm       │
+   │  🏨 Hotel apps     → Apply temperature preferences        │
+   │  📱 Other IoT hubs → Sync routines across locations       │
+   │  🎵 Music service  → Queue relaxing music at 10:30pm      │
+   │                                                            │
+   └────────────────────────────────────────────────────────────┘
+
+   This is the power of USER-OWNED profiles:
+   → IoT learnings benefit your entire digital ecosystem.
+
+"""
+
+AUTOMATION_09 = """\
+🤖 Step 8: Smart Home suggests automation rules...
+
+   Based on learned patterns, HomeWise suggests:
+
+   ┌─────────────────────────────────────────────────────────┐
+   │ 🌅 "Good Morning" Automation                           │
+   │    Trigger: Motion detected after 6:30am               │
+   │    Actions:                                            │
+   │      • Open bedroom blinds                             │
+   │      • Set thermostat to 21°C                          │
+   │      • Start coffee maker                              │
+   │      • Play morning news briefing                      │
+   └─────────────────────────────────────────────────────────┘
+   ┌─────────────────────────────────────────────────────────┐
+   │ 🏠 "Welcome Home" Automation                           │
+   │    Trigger: Phone GPS within 10 min of home (6pm+)     │
+   │    Actions:                                            │
+   │      • Set thermostat to 21°C                          │
+   │      • Turn on entryway lights                         │
+   │      • Disarm security system                          │
+   └─────────────────────────────────────────────────────────┘
+   ┌─────────────────────────────────────────────────────────┐
+   │ 🌙 "Good Night" Automation                             │
+   │    Trigger: All lights off after 11pm                  │
+   │    Actions:                                            │
+   │      • Lower thermostat to 18°C                        │
+   │      • Lock all doors                                  │
+   │      • Arm security system                             │
+   │      • Enable Do Not Disturb on all devices            │
+   └─────────────────────────────────────────────────────────┘
+
+"""
+
+SUMMARY_09 = """\
+═══════════════════════════════════════════════════════════
+                    ✨ Example Complete!
+═══════════════════════════════════════════════════════════
+
+   Key takeaways:
+
+   1. a2p works for IoT devices, not just AI agents
+   2. Smart home sensors can propose learned patterns
+   3. Users control what routines get saved to their profile
+   4. Approved patterns benefit the entire device ecosystem
+   5. Privacy-preserving: user owns all behavioral data
+   6. Portable: preferences work in any a2p-compatible home
+
+"""
+
+
+async def run_example():
+    _write = sys.stdout.write
+
+    # Queued writes are committed and the worker stopped even if a step fails
+    async with storage:
+        _write(HEADER_09)
+
+        # ============================================
+        # 1. Setup User Profile with Home Preferences
+        # ============================================
+        print("👤 Step 1: Setting up user profile with home preferences...\n")
+
+        user = create_user_client(storage)
+        profile = await user.create_profile(display_name="Alex")
+
+        # Add policy for smart home services
+        user.profile = add_consent_policy(user.get_profile(), HOME_POLICY)
+
+        # Add existing home preferences
+        home_mems = [
+            dict(
+                content="Preferred temperature: 21°C (70°F) during the day",
+                category="a2p:preferences.environment",
+            ),
+            dict(
+                content="Prefers dimmed warm lighting in the evening",
+                category="a2p:preferences.lighting",
+            ),
+            dict(
+                content="Usually wakes up around 7:00am on weekdays",
+                category="a2p:routines.schedule",
+            ),
+            dict(
+                content="Works from home on Mondays and Fridays",
+                category="a2p:routines.work",
+            ),
+        ]
+
+        # Policy and memories are committed together in a single save
+        await user.add_memories(home_mems)
+
+        _write(
+            f"   ✅ Profile created: {profile.id}\n"
+            "   ✅ Home preferences added\n"
+            "   ✅ Consent policy for IoT services configured\n\n"
+        )
+
+        # ============================================
+        # 2. Smart Home Hub Reads Profile
+        # ============================================
+        print("🏠 Step 2: Smart Home Hub reading user profile...\n")
+
+        # The smart home hub is a "service" not an "agent" — same protocol!
+        smart_home = create_agent_client(
+            agent_did="did:a2p:service:local:iot-homewise",
+            storage=storage,
+        )
+
+        user_profile = await smart_home.get_profile(
+            user_did=profile.id,
+            scopes=["a2p:preferences", "a2p:routines"],
+        )
+
+        memories = user_profile.memories.episodic if user_profile.memories else []
+        _write(
+            "   📋 Retrieved preferences from a2p profile:\n"
+            + "".join([f"      • {memory.content}\n" for memory in memories])
+            + "\n"
+        )
+
+        # ============================================
+        # 3. Apply Personalized Automation
+        # ============================================
+        print("⚡ Step 3: Applying personalized automation...\n")
+
+        _write(
+            "   🌡️  Thermostat → Set to 21°C (from profile)\n"
+            "   💡 Living Room → Warm dimmed lights (evening mode)\n"
+            "   ⏰ Wake routine → Scheduled for 7:00am weekdays\n"
+            "   🏢 Work mode → Home office setup for Mon/Fri\n\n"
+            "   📱 Device actions executed:\n"
+            + "\n".join(map(_DEVICE_FMT, DEVICE_ACTIONS))
+            + "\n\n"
+        )
+
+        # ============================================
+        # 4. Learn Patterns from Sensors (Simulated)
+        # ============================================
+        print("📊 Step 4: Learning patterns from sensor data...\n")
+
+        _write(
+            "   📈 Pattern analysis over 4 weeks:\n\n"
+            + "\n".join(map(_PATTERN_FMT, PATTERNS))
+            + "\n\n"
+        )
+
+        # ============================================
+        # 5. Propose Learned Routines to Profile
+        # ============================================
+        print("💡 Step 5: Proposing learned routines to user profile...\n")
+
+        await smart_home.propose_memories(
+            profile.id,
+            [
+                dict(content=p.content, category=p.category, confidence=p.confidence, context=p.context)
+                for p in PROPOSALS
+            ],
+        )
+        _write("\n".join(map(_PROPOSED_FMT, PROPOSALS)) + "\n\n")
+
+        # ============================================
+        # 6. Cross-Device/Service Benefits
+        # ============================================
+        _write(CROSS_SERVICE_09)
+
+        # ============================================
+        # 7. User Reviews Proposals
+        # ============================================
+        print("👤 Step 7: Alex reviews and manages proposals...\n")
+
+        await user.load_profile(profile.id)
+        proposals = user.get_pending_proposals()
 
         # Simulate user decision (approve high confidence, review low confidence)
-        if (proposal.memory.confidence or 0) >= 0.8:
-            await user.approve_proposal(proposal.id)
-            print("      ✅ Approved\n")
-            approved += 1
-        else:
-            await user.reject_proposal(proposal.id)
-            print("      ❌ Rejected (will review manually)\n")
-            rejected += 1
-
-    print(f"   Summary: {approved} approved, {rejected} rejected for manual review\n")
-
-    # ============================================
-    # 8. Suggested Automation Rules
-    # ============================================
-    print("🤖 Step 8: Smart Home suggests automation rules...\n")
-
-    print("   Based on learned patterns, HomeWise suggests:\n")
-    print("   ┌─────────────────────────────────────────────────────────┐")
-    print('   │ 🌅 "Good Morning" Automation                           │')
-    print("   │    Trigger: Motion detected after 6:30am               │")
-    print("   │    Actions:                                            │")
-    print("   │      • Open bedroom blinds                             │")
-    print("   │      • Set thermostat to 21°C                          │")
-    print("   │      • Start coffee maker                              │")
-    print("   │      • Play morning news briefing                      │")
-    print("   └─────────────────────────────────────────────────────────┘")
-    print("   ┌─────────────────────────────────────────────────────────┐")
-    print('   │ 🏠 "Welcome Home" Automation                           │')
-    print("   │    Trigger: Phone GPS within 10 min of home (6pm+)     │")
-    print("   │    Actions:                                            │")
-    print("   │      • Set thermostat to 21°C                          │")
-    print("   │      • Turn on entryway lights                         │")
-    print("   │      • Disarm security system                          │")
-    print("   └─────────────────────────────────────────────────────────┘")
-    print("   ┌─────────────────────────────────────────────────────────┐")
-    print('   │ 🌙 "Good Night" Automation                             │')
-    print("   │    Trigger: All lights off after 11pm                  │")
-    print("   │    Actions:                                            │")
-    print("   │      • Lower thermostat to 18°C                        │")
-    print("   │      • Lock all doors                                  │")
-    print("   │      • Arm security system                             │")
-    print("   │      • Enable Do Not Disturb on all devices            │")
-    print("   └─────────────────────────────────────────────────────────┘\n")
-
-    # ============================================
-    # Summary
-    # ============================================
-    print("═══════════════════════════════════════════════════════════")
-    print("                    ✨ Example Complete!")
-    print("═══════════════════════════════════════════════════════════\n")
-    print("   Key takeaways:\n")
-    print("   1. a2p works for IoT devices, not just AI agents")
-    print("   2. Smart home sensors can propose learned patterns")
-    print("   3. Users control what routines get saved to their profile")
-    print("   4. Approved patterns benefit the entire device ecosystem")
-    print("   5. Privacy-preserving: user owns all behavioral data")
-    print("   6. Portable: preferences work in any a2p-compatible home\n")
+        confidences = [proposal.memory.confidence or 0.0 for proposal in proposals]
+        pcts = pct_round(confidences)
+        mask = select_high_confidence(confidences, APPROVAL_THRESHOLD)
+
+        lines = []
+        approve_ids = []
+        reject_ids = []
+        for proposal, pct, approve in zip(proposals, pcts, mask):
+            rendered = _PROPOSAL_FMT(
+                c=proposal.memory.content, d=proposal.proposed_by.agent_did, p=pct
+            )
+            if approve:
+                approve_ids.append(proposal.id)
+                lines.append(rendered + "      ✅ Approved\n\n")
+            else:
+                reject_ids.append(proposal.id)
+                lines.append(rendered + "      ❌ Rejected (will review manually)\n\n")
+
+        await user.approve_proposals(approve_ids)
+        await user.reject_proposals(reject_ids)
+        _write("".join(lines))
+
+        approved = len(approve_ids)
+        rejected = len(reject_ids)
+        print(f"   Summary: {approved} approved, {rejected} rejected for manual review\n")
+
+        # ============================================
+        # 8. Suggested Automation Rules
+        # ============================================
+        _write(AUTOMATION_09)
+
+        # ============================================
+        # Summary
+        # ============================================
+        _write(SUMMARY_09)
+        sys.stdout.flush()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(run_example())
@@ -0,0 +1,46 @@
+"""
+Bulk min/max checks for enforced policy rules.
+
+Auditing an organisation means validating many candidate values against the
+same numeric bound, so the comparison is written once over arrays. Numba
+compiles it to native code when installed; otherwise NumPy runs the same
+expression, and without NumPy a plain Python loop is used. Every backend
+returns plain lists.
+"""
+
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to Python
+    np = None
+
+try:
+    import numba
+
+    _HAS_NUMBA = True
+except ImportError:  # Numba is optional; fall back to NumPy
+    _HAS_NUMBA = False
+
+
+# Below this many items the array conversion costs more than it saves
+VECTORIZE_MIN = 32
+
+
+def _check_numeric(values, bound, is_min):
+    if is_min:
+        return values < bound
+    return values > bound
+
+
+if _HAS_NUMBA:
+    _check_numeric = numba.njit(cache=True, nogil=True)(_check_numeric)
+
+
+def numeric_violations(values: Sequence[float], bound: float, is_min: bool) -> list[bool]:
+    """Return, per value, whether it falls below (``is_min``) or above ``bound``."""
+    if np is not None and len(values) >= VECTORIZE_MIN:
+        return _check_numeric(np.asarray(values, dtype=np.float64), float(bound), is_min).tolist()
+    if is_min:
+        return [v < bound for v in values]
+    return [v > bound for v in values]
@@ -7,20 +7,63 @@ can use a2p entity profiles with hierarchical policy enforcement.
 
 import asyncio
 import json
-from typing import Any, Optional
-from dataclasses import dataclass
+import sys
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+from typing import Any, Callable, NamedTuple, Optional
+from dataclasses import dataclass, field
 
+from _policy_numba import numeric_violations
 
-@dataclass
+
+class ValidationResult(NamedTuple):
+    allowed: bool
+    reason: str = ""
+
+
+# Shared result for every allowed change
+_ALLOWED = ValidationResult(True)
+
+
+@dataclass(slots=True, frozen=True)
 class EnforcedRule:
     id: str
     path: str
     value: Any
     enforcement: str  # 'locked' | 'min' | 'max' | 'subset' | 'additive' | 'narrowable' | 'overridable'
     reason: str
-
-
-@dataclass
+    # JSON form of value, encoded once for messages and listings
+    _value_json: str = field(init=False, repr=False, compare=False)
+    # Membership set for 'subset' rules, built once instead of per validation
+    _value_set: Optional[frozenset] = field(init=False, repr=False, compare=False)
+    # Check for this rule's enforcement type; None if it never blocks a change
+    _validator: Optional[Callable[..., Optional[ValidationResult]]] = field(
+        init=False, repr=False, compare=False
+    )
+    # Predicate with this rule's value bound in: True if a new value passes,
+    # i.e. exactly when _validator would return None. Set whenever _validator
+    # is, which is only called once _check fails.
+    _check: Optional[Callable[[Any], bool]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Enforcement types and paths repeat across rules; interned copies
+        # compare and hash by identity in dict lookups
+        object.__setattr__(self, "enforcement", sys.intern(self.enforcement))
+        object.__setattr__(self, "path", sys.intern(self.path))
+        object.__setattr__(self, "_value_json", json.dumps(self.value))
+
+        if self.enforcement == "subset" and isinstance(self.value, list):
+            value_set = frozenset(self.value)
+        else:
+            value_set = None
+        object.__setattr__(self, "_value_set", value_set)
+
+        object.__setattr__(self, "_validator", _ENFORCEMENT_HANDLERS.get(self.enforcement))
+        build_check = _CHECK_BUILDERS.get(self.enforcement)
+        object.__setattr__(self, "_check", build_check(self) if build_check else None)
+
+
+@dataclass(slots=True, frozen=True)
 class EntityProfile:
     id: str
     profile_type: str
@@ -28,16 +71,31 @@ class EntityProfile:
     entity_type: str
     description: Optional[str]
     parent: Optional[str]
-    children: list[str]
+    children: tuple[str, ...]
     inherit_policies: bool
     depth: int
-    enforced_rules: list[EnforcedRule]
+    enforced_rules: tuple[EnforcedRule, ...]
     policies: dict[str, Any]
-    direct_members: list[str]
-    admins: list[str]
+    direct_members: tuple[str, ...]
+    admins: tuple[str, ...]
+    # Index of enforced_rules for point lookups; a path may carry several rules
+    # (e.g. a min and a max), kept in declaration order
+    enforced_rules_by_path: dict[str, tuple[EnforcedRule, ...]] = field(
+        init=False, repr=False, compare=False
+    )
 
+    def __post_init__(self) -> None:
+        # Ids are the keys of every cache below; parent ids repeat across siblings
+        object.__setattr__(self, "id", sys.intern(self.id))
+        if self.parent is not None:
+            object.__setattr__(self, "parent", sys.intern(self.parent))
+        by_path: dict[str, tuple[EnforcedRule, ...]] = {}
+        for rule in self.enforced_rules:
+            by_path[rule.path] = by_path.get(rule.path, ()) + (rule,)
+        object.__setattr__(self, "enforced_rules_by_path", by_path)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class EffectivePolicy:
     value: Any
     source: str
@@ -48,14 +106,90 @@ class EffectivePolicy:
 # Simulated entity storage
 entities: dict[str, EntityProfile] = {}
 
+# Memoized get_ancestry results; callers must not mutate the returned lists.
+# Entities are added through register_entity so the caches stay consistent.
+_ancestry_cache: dict[str, list[tuple[str, Optional[EntityProfile]]]] = {}
+
+# Memoized compute_effective_policies results
+_effective_cache: dict[str, Mapping[str, EffectivePolicy]] = {}
+
+# Every id registered below each entity, kept up to date by register_entity
+_descendants_cache: dict[str, set[str]] = {}
+
+# Number of enforced rules across each entity's ancestors (excluding itself)
+_rule_counts: dict[str, int] = {}
+
+# Per entity and path, the ancestors' checking rules nearest first; ancestors
+# with no rule for the path are skipped when the chain is built
+_governing_cache: dict[str, dict[str, tuple[tuple[EnforcedRule, EntityProfile], ...]]] = {}
+
+_NO_POLICIES: Mapping[str, EffectivePolicy] = MappingProxyType({})
+
+
+def register_entity(entity: EntityProfile) -> None:
+    entities[entity.id] = entity
+    _invalidate(entity.id)
+
+    # The entity and anything registered under it before it arrived are
+    # now descendants of each of its ancestors
+    subtree = {entity.id} | _descendants_cache.get(entity.id, set())
+    for ancestor_id, _ in get_ancestry(entity.id)[1:]:
+        _descendants_cache.setdefault(ancestor_id, set()).update(subtree)
+
+
+def _invalidate(entity_id: str) -> None:
+    # Cached results for the entity and all of its descendants depend on it
+    for stale_id in (entity_id, *_descendants_cache.get(entity_id, ())):
+        _ancestry_cache.pop(stale_id, None)
+        _effective_cache.pop(stale_id, None)
+        _rule_counts.pop(stale_id, None)
+        _governing_cache.pop(stale_id, None)
+
+
+def _ancestor_rule_count(entity_id: str) -> int:
+    count = _rule_counts.get(entity_id)
+    if count is None:
+        count = 0
+        for _, ancestor in get_ancestry(entity_id)[1:]:
+            if ancestor:
+                count += len(ancestor.enforced_rules)
+        _rule_counts[entity_id] = count
+    return count
+
+
+def _governing_rules(
+    entity_id: str, path: str
+) -> tuple[tuple[EnforcedRule, EntityProfile], ...]:
+    by_path = _governing_cache.setdefault(entity_id, {})
+    chain = by_path.get(path)
+    if chain is None:
+        links = []
+        for _, entity in get_ancestry(entity_id)[1:]:  # Skip self
+            if not entity:
+                continue
+            for rule in entity.enforced_rules_by_path.get(path, ()):
+                if rule._validator is not None:
+                    links.append((rule, entity))
+        chain = by_path[path] = tuple(links)
+    return chain
+
+
+def compute_effective_policies(entity_id: str) -> Mapping[str, EffectivePolicy]:
+    cached = _effective_cache.get(entity_id)
+    if cached is not None:
+        return cached
+
+    # Nothing is enforced anywhere in the chain
+    entity = entities.get(entity_id)
+    if not _ancestor_rule_count(entity_id) and not (entity and entity.enforced_rules):
+        _effective_cache[entity_id] = _NO_POLICIES
+        return _NO_POLICIES
 
-def compute_effective_policies(entity_id: str) -> dict[str, EffectivePolicy]:
     result = {}
     ancestry = get_ancestry(entity_id)
 
     # Process from root to leaf
-    for ancestor_id in reversed(ancestry):
-        entity = entities.get(ancestor_id)
+    for _, entity in reversed(ancestry):
         if not entity or not entity.enforced_rules:
             continue
 
@@ -67,76 +201,264 @@ def compute_effective_policies(entity_id: str) -> dict[str, EffectivePolicy]:
                 locked=rule.enforcement == "locked",
             )
 
-    return result
+    # Read-only view so callers cannot alter the cached result
+    frozen = MappingProxyType(result)
+    _effective_cache[entity_id] = frozen
+    return frozen
+
 
+def get_ancestry(entity_id: str) -> list[tuple[str, Optional[EntityProfile]]]:
+    # (id, entity) pairs from the entity up to the root; the entity is None
+    # for a parent that has not been registered yet
+    cached = _ancestry_cache.get(entity_id)
+    if cached is not None:
+        return cached
 
-def get_ancestry(entity_id: str) -> list[str]:
-    result = [entity_id]
     current = entities.get(entity_id)
+    result = [(entity_id, current)]
 
     while current and current.parent:
-        result.append(current.parent)
-        current = entities.get(current.parent)
+        parent_id = current.parent
+        current = entities.get(parent_id)
+        result.append((parent_id, current))
 
+    _ancestry_cache[entity_id] = result
     return result
 
 
+# Numeric types checked by min/max rules; subclasses (bool, IntEnum,
+# numpy.float64, ...) count too, so they cannot slip past a bound
+_NUMERIC = (int, float)
+
+
+def _check_locked(new_value: Any, rule: EnforcedRule, entity: EntityProfile) -> Optional[ValidationResult]:
+    if new_value != rule.value:
+        return ValidationResult(
+            False,
+            f'"{rule.path}" is locked by {entity.display_name}: {rule.reason}',
+        )
+    return None
+
+
+def _check_min(new_value: Any, rule: EnforcedRule, entity: EntityProfile) -> Optional[ValidationResult]:
+    if isinstance(new_value, _NUMERIC) and new_value < rule.value:
+        return ValidationResult(
+            False,
+            f'"{rule.path}" minimum is {rule.value} (set by {entity.display_name})',
+        )
+    return None
+
+
+def _check_max(new_value: Any, rule: EnforcedRule, entity: EntityProfile) -> Optional[ValidationResult]:
+    if isinstance(new_value, _NUMERIC) and new_value > rule.value:
+        return ValidationResult(
+            False,
+            f'"{rule.path}" maximum is {rule.value} (set by {entity.display_name})',
+        )
+    return None
+
+
+def _check_subset(new_value: Any, rule: EnforcedRule, entity: EntityProfile) -> Optional[ValidationResult]:
+    if isinstance(new_value, list) and rule._value_set is not None:
+        invalid_items = [v for v in new_value if v not in rule._value_set]
+        if invalid_items:
+            return ValidationResult(
+                False,
+                f'"{rule.path}" must be subset of {rule._value_json}. Invalid: {", ".join(invalid_items)}',
+            )
+    return None
+
+
+# Enforcement type → check; types not listed here never block a change
+_ENFORCEMENT_HANDLERS: dict[str, Callable[..., Optional[ValidationResult]]] = {
+    "locked": _check_locked,
+    "min": _check_min,
+    "max": _check_max,
+    "subset": _check_subset,
+}
+
+
+# Each predicate negates its _check_* condition as written, so both agree
+# on values such as NaN that fail every comparison
+def _locked_check(rule: EnforcedRule) -> Callable[[Any], bool]:
+    value = rule.value
+    return lambda v: not v != value
+
+
+def _min_check(rule: EnforcedRule) -> Callable[[Any], bool]:
+    bound, numeric = rule.value, _NUMERIC
+    return lambda v: not (isinstance(v, numeric) and v < bound)
+
+
+def _max_check(rule: EnforcedRule) -> Callable[[Any], bool]:
+    bound, numeric = rule.value, _NUMERIC
+    return lambda v: not (isinstance(v, numeric) and v > bound)
+
+
+def _subset_check(rule: EnforcedRule) -> Callable[[Any], bool]:
+    allowed = rule._value_set
+    if allowed is None:
+        return lambda v: True
+    return lambda v: not isinstance(v, list) or allowed.issuperset(v)
+
+
+# Enforcement type → builder of the rule's _check predicate
+_CHECK_BUILDERS: dict[str, Callable[[EnforcedRule], Callable[[Any], bool]]] = {
+    "locked": _locked_check,
+    "min": _min_check,
+    "max": _max_check,
+    "subset": _subset_check,
+}
+
+
 def validate_policy_change(
     entity_id: str,
     path: str,
     new_value: Any
-) -> dict[str, Any]:
-    ancestry = get_ancestry(entity_id)
+) -> ValidationResult:
+    # No ancestor enforces anything, so every change is allowed
+    if not _ancestor_rule_count(entity_id):
+        return _ALLOWED
 
-    for ancestor_id in ancestry:
-        if ancestor_id == entity_id:
-            continue  # Skip self
+    for rule, entity in _governing_rules(entity_id, path):
+        if not rule._check(new_value):
+            return rule._validator(new_value, rule, entity)
 
-        entity = entities.get(ancestor_id)
-        if not entity or not entity.enforced_rules:
-            continue
+    return _ALLOWED
 
-        for rule in entity.enforced_rules:
-            if rule.path != path:
-                continue
 
-            if rule.enforcement == "locked":
-                if new_value != rule.value:
-                    return {
-                        "allowed": False,
-                        "reason": f'"{path}" is locked by {entity.display_name}: {rule.reason}',
-                    }
-
-            elif rule.enforcement == "min":
-                if isinstance(new_value, (int, float)) and new_value < rule.value:
-                    return {
-                        "allowed": False,
-                        "reason": f'"{path}" minimum is {rule.value} (set by {entity.display_name})',
-                    }
-
-            elif rule.enforcement == "max":
-                if isinstance(new_value, (int, float)) and new_value > rule.value:
-                    return {
-                        "allowed": False,
-                        "reason": f'"{path}" maximum is {rule.value} (set by {entity.display_name})',
-                    }
-
-            elif rule.enforcement == "subset":
-                if isinstance(new_value, list) and isinstance(rule.value, list):
-                    parent_set = set(rule.value)
-                    invalid_items = [v for v in new_value if v not in parent_set]
-                    if invalid_items:
-                        return {
-                            "allowed": False,
-                            "reason": f'"{path}" must be subset of {json.dumps(rule.value)}. Invalid: {", ".join(invalid_items)}',
-                        }
-
-    return {"allowed": True}
+def validate_policy_changes_batch(
+    entity_id: str,
+    path: str,
+    values: Sequence[Any]
+) -> list[ValidationResult]:
+    # Same results as validate_policy_change per value, with min/max bounds
+    # checked over the whole batch at once
+    results: list[Optional[ValidationResult]] = [None] * len(values)
+    if _ancestor_rule_count(entity_id):
+        all_numeric = all(isinstance(v, _NUMERIC) for v in values)
+        for rule, entity in _governing_rules(entity_id, path):
+            if all_numeric and rule.enforcement in ("min", "max") and isinstance(rule.value, _NUMERIC):
+                flagged = numeric_violations(values, rule.value, rule.enforcement == "min")
+            else:
+                check = rule._check
+                flagged = [not check(v) for v in values]
+
+            # Earlier ancestors win, so only fill rows that are still allowed
+            for i, hit in enumerate(flagged):
+                if hit and results[i] is None:
+                    results[i] = rule._validator(values[i], rule, entity)
+
+    return [r or _ALLOWED for r in results]
+
+
+def validate_many(
+    entity_ids: Sequence[str],
+    paths: Sequence[str],
+    values: Sequence[Any]
+) -> list[ValidationResult]:
+    # Audit entry point over (entity, path, value) triples: rows sharing an
+    # entity and path are validated as one batch, results come back in order
+    groups: dict[tuple[str, str], list[int]] = {}
+    for i, key in enumerate(zip(entity_ids, paths)):
+        groups.setdefault(key, []).append(i)
+
+    results: list[ValidationResult] = [_ALLOWED] * len(values)
+    for (entity_id, path), rows in groups.items():
+        batch = validate_policy_changes_batch(entity_id, path, [values[i] for i in rows])
+        for i, result in zip(rows, batch):
+            results[i] = result
+    return results
+
+
+_RULE_FMT = "      • {0.path} = {0._value_json} [{0.enforcement}]".format
+_ATTEMPT_FMT = "   Attempt: {}\n   Result: {}\n{}\n".format
+
+
+def _attempt(description: str, result: ValidationResult) -> str:
+    reason = "" if result.allowed else f"   Reason: {result.reason}\n"
+    return _ATTEMPT_FMT(description, "✅ Allowed" if result.allowed else "❌ Blocked", reason)
+
+
+HEADER_10 = """\
+🚀 a2p Example: Entity Hierarchy with Enforced Policies
+
+═══════════════════════════════════════════════════════════
+
+"""
+
+ALICE_POLICIES_10 = """\
+👤 Step 6: Computing Alice's effective policies...
+
+   Alice is a member of ML Team, which inherits from:
+   └── Engineering (department)
+       └── ACME Corp (organization)
+
+   Alice's effective policies:
+   ┌─────────────────────────────────────────────────────────┐
+   │ 🔐 GDPR Compliance: true (from ACME Corp, locked)       │
+   │ 🔐 Data Residency: EU (from ACME Corp, locked)          │
+   │ 🔐 Max Retention: 36 months (from ACME Corp, max)       │
+   │ 🔐 Min Encryption: 256 bits (from ACME Corp, min)       │
+   │ 🔐 Code Review: required (from Engineering, locked)     │
+   │ 🔐 CI Required: true (from Engineering, locked)         │
+   │ 📝 Allowed AI Models: ["claude-3"] (from ML Team)       │
+   │ 🔐 Experiment Tracking: true (from ML Team, locked)     │
+   └─────────────────────────────────────────────────────────┘
+
+"""
+
+TREE_10 = """\
+🌳 Step 7: Entity Hierarchy Visualization
+
+   ┌─────────────────────────────────────────────────────────────┐
+   │                     ACME CORPORATION                        │
+   │        entityType: organization | depth: 0                  │
+   │   ENFORCES: gdpr, dataResidency, retention, encryption      │
+   └─────────────────────────────────┬───────────────────────────┘
+                                     │
+           ┌─────────────────────────┴─────────────────────┐
+           │                                               │
+   ┌───────▼───────┐                             ┌─────────▼─────────┐
+   │  ENGINEERING  │                             │      SALES        │
+   │   department  │                             │    department     │
+   │ +codeReview   │                             │                   │
+   │ +ciRequired   │                             │                   │
+   └───────┬───────┘                             └───────────────────┘
+           │
+   ┌───────┴───────┐
+   │               │
+┌──▼──┐        ┌───▼────┐
+│ ML  │        │Platform│
+│Team │        │ Team   │
+│     │        │        │
+│Alice│        │  Bob   │
+│ Bob │        │        │
+└─────┘        └────────┘
+
+"""
+
+SUMMARY_10 = """\
+═══════════════════════════════════════════════════════════
+                    ✨ Example Complete!
+═══════════════════════════════════════════════════════════
+
+   Key takeaways:
+
+   1. Entities form hierarchies (org → dept → team → user)
+   2. Enforced policies flow down and cannot be overridden
+   3. Different enforcement types: locked, min, max, subset, additive
+   4. Users inherit effective policies from their entity chain
+   5. Policy validation prevents unauthorized changes
+   6. Flexible entity types: organization, department, team, project, etc.
+
+"""
 
 
 async def main():
-    print("🚀 a2p Example: Entity Hierarchy with Enforced Policies\n")
-    print("═══════════════════════════════════════════════════════════\n")
+    _write = sys.stdout.write
+
+    _write(HEADER_10)
 
     # ============================================
     # 1. Create Organization (Top Level)
@@ -150,33 +472,34 @@ async def main():
         entity_type="organization",
         description="Global technology company",
         parent=None,
-        children=["did:a2p:entity:local:local:acme-engineering", "did:a2p:entity:local:local:acme-sales"],
+        children=("did:a2p:entity:local:local:acme-engineering", "did:a2p:entity:local:local:acme-sales"),
         inherit_policies=False,
         depth=0,
-        enforced_rules=[
+        enforced_rules=(
             EnforcedRule("gdpr-compliance", "policies.compliance.gdpr", True, "locked", "Legal requirement for EU operations"),
             EnforcedRule("data-residency", "policies.data.residency", ["EU"], "locked", "Corporate data sovereignty policy"),
             EnforcedRule("max-retention", "policies.data.retention.maxMonths", 36, "max", "GDPR data minimization"),
             EnforcedRule("min-encryption", "policies.security.encryption.minBits", 256, "min", "Security baseline"),
             EnforcedRule("allowed-ai-models", "policies.ai.allowedModels", ["gpt-4", "claude-3", "gemini-pro"], "subset", "Only security-vetted models"),
             EnforcedRule("ai-blocklist", "policies.ai.blockedModels", ["legacy-gpt-*"], "additive", "Security team blocklist"),
-        ],
+        ),
         policies={
             "compliance": {"gdpr": True, "ccpa": True},
             "data": {"residency": ["EU"], "retention": {"maxMonths": 36}},
             "security": {"encryption": {"minBits": 256}, "mfaRequired": True},
             "ai": {"allowedModels": ["gpt-4", "claude-3", "gemini-pro"], "blockedModels": ["legacy-gpt-*"]},
         },
-        direct_members=[],
-        admins=["did:a2p:user:local:local:ceo"],
+        direct_members=(),
+        admins=("did:a2p:user:local:local:ceo",),
     )
 
-    entities[acme_corp.id] = acme_corp
-    print(f"   ✅ Created: {acme_corp.display_name}")
-    print("   📋 Enforced policies:")
-    for rule in acme_corp.enforced_rules:
-        print(f"      • {rule.path} = {json.dumps(rule.value)} [{rule.enforcement}]")
-    print()
+    register_entity(acme_corp)
+    _write(
+        f"   ✅ Created: {acme_corp.display_name}\n"
+        "   📋 Enforced policies:\n"
+        + "\n".join(map(_RULE_FMT, acme_corp.enforced_rules))
+        + "\n\n"
+    )
 
     # ============================================
     # 2. Create Engineering Department
@@ -190,28 +513,29 @@ async def main():
         entity_type="department",
         description="Product and platform engineering",
         parent="did:a2p:entity:local:local:acme-corp",
-        children=["did:a2p:entity:local:local:acme-ml-team", "did:a2p:entity:local:local:acme-platform-team"],
+        children=("did:a2p:entity:local:local:acme-ml-team", "did:a2p:entity:local:local:acme-platform-team"),
         inherit_policies=True,
         depth=1,
-        enforced_rules=[
+        enforced_rules=(
             EnforcedRule("code-review", "policies.development.codeReview", True, "locked", "Engineering quality standard"),
             EnforcedRule("ci-required", "policies.development.ciRequired", True, "locked", "Continuous integration mandatory"),
-        ],
+        ),
         policies={
             "development": {"codeReview": True, "ciRequired": True},
             "tools": {"ide": "vscode", "vcs": "git"},
         },
-        direct_members=[],
-        admins=["did:a2p:user:local:local:vp-engineering"],
+        direct_members=(),
+        admins=("did:a2p:user:local:local:vp-engineering",),
     )
 
-    entities[engineering.id] = engineering
-    print(f"   ✅ Created: {engineering.display_name}")
-    print(f"   📎 Parent: {engineering.parent}")
-    print("   📋 Additional enforced policies:")
-    for rule in engineering.enforced_rules:
-        print(f"      • {rule.path} = {json.dumps(rule.value)} [{rule.enforcement}]")
-    print()
+    register_entity(engineering)
+    _write(
+        f"   ✅ Created: {engineering.display_name}\n"
+        f"   📎 Parent: {engineering.parent}\n"
+        "   📋 Additional enforced policies:\n"
+        + "\n".join(map(_RULE_FMT, engineering.enforced_rules))
+        + "\n\n"
+    )
 
     # ============================================
     # 3. Create ML Team
@@ -225,29 +549,30 @@ async def main():
         entity_type="team",
         description="Machine learning and AI research",
         parent="did:a2p:entity:local:local:acme-engineering",
-        children=[],
+        children=(),
         inherit_policies=True,
         depth=2,
-        enforced_rules=[
+        enforced_rules=(
             EnforcedRule("experiment-tracking", "policies.ml.experimentTracking", True, "locked", "ML reproducibility requirement"),
-        ],
+        ),
         policies={
             # Narrowing the AI models (valid: subset of parent's list)
             "ai": {"allowedModels": ["claude-3"]},
             "ml": {"experimentTracking": True, "gpuAccess": True},
             "tools": {"ide": "vscode", "notebooks": "jupyter"},
         },
-        direct_members=["did:a2p:user:local:local:alice", "did:a2p:user:local:local:bob"],
-        admins=["did:a2p:user:local:local:alice"],
+        direct_members=("did:a2p:user:local:local:alice", "did:a2p:user:local:local:bob"),
+        admins=("did:a2p:user:local:local:alice",),
     )
 
-    entities[ml_team.id] = ml_team
-    print(f"   ✅ Created: {ml_team.display_name}")
-    print(f"   📎 Parent: {ml_team.parent}")
-    print(f"   👥 Members: {', '.join(ml_team.direct_members)}")
-    print("   📋 Team policies:")
-    print(f"      • AI models narrowed to: {json.dumps(ml_team.policies.get('ai'))}")
-    print()
+    register_entity(ml_team)
+    _write(
+        f"   ✅ Created: {ml_team.display_name}\n"
+        f"   📎 Parent: {ml_team.parent}\n"
+        f"   👥 Members: {', '.join(ml_team.direct_members)}\n"
+        "   📋 Team policies:\n"
+        f"      • AI models narrowed to: {json.dumps(ml_team.policies.get('ai'))}\n\n"
+    )
 
     # ============================================
     # 4. Compute Effective Policies for ML Team
@@ -256,13 +581,13 @@ async def main():
 
     effective_policies = compute_effective_policies(ml_team.id)
 
-    print("   🔒 Effective policies (inherited + local):")
+    lines = ["   🔒 Effective policies (inherited + local):"]
     for path, policy in effective_policies.items():
         lock_icon = "🔐" if policy.locked else "📝"
-        print(f"      {lock_icon} {path}")
-        print(f"         Value: {json.dumps(policy.value)}")
-        print(f"         Source: {policy.source} [{policy.enforcement}]")
-    print()
+        lines.append(f"      {lock_icon} {path}")
+        lines.append(f"         Value: {json.dumps(policy.value)}")
+        lines.append(f"         Source: {policy.source} [{policy.enforcement}]")
+    _write("\n".join(lines) + "\n\n")
 
     # ============================================
     # 5. Validate Policy Changes
@@ -270,107 +595,38 @@ async def main():
     print("🔍 Step 5: Validating policy change attempts...\n")
 
     # Attempt 1: Try to disable GDPR (should fail - locked)
-    print("   Attempt: ML Team tries to disable GDPR compliance")
     gdpr_result = validate_policy_change(ml_team.id, "policies.compliance.gdpr", False)
-    print(f"   Result: {'✅ Allowed' if gdpr_result['allowed'] else '❌ Blocked'}")
-    if not gdpr_result["allowed"]:
-        print(f"   Reason: {gdpr_result['reason']}")
-    print()
-
     # Attempt 2: Try to reduce encryption to 128 bits (should fail - min is 256)
-    print("   Attempt: ML Team tries to set encryption to 128 bits")
     encryption_result = validate_policy_change(ml_team.id, "policies.security.encryption.minBits", 128)
-    print(f"   Result: {'✅ Allowed' if encryption_result['allowed'] else '❌ Blocked'}")
-    if not encryption_result["allowed"]:
-        print(f"   Reason: {encryption_result['reason']}")
-    print()
-
     # Attempt 3: Try to increase encryption to 512 bits (should work - above min)
-    print("   Attempt: ML Team tries to set encryption to 512 bits")
     encryption512_result = validate_policy_change(ml_team.id, "policies.security.encryption.minBits", 512)
-    print(f"   Result: {'✅ Allowed' if encryption512_result['allowed'] else '❌ Blocked'}")
-    print()
-
     # Attempt 4: Try to use an unapproved AI model (should fail - not in subset)
-    print('   Attempt: ML Team tries to add "llama-2" to allowed models')
     model_result = validate_policy_change(ml_team.id, "policies.ai.allowedModels", ["claude-3", "llama-2"])
-    print(f"   Result: {'✅ Allowed' if model_result['allowed'] else '❌ Blocked'}")
-    if not model_result["allowed"]:
-        print(f"   Reason: {model_result['reason']}")
-    print()
-
     # Attempt 5: Try to reduce allowed models (should work - valid subset)
-    print('   Attempt: ML Team narrows allowed models to just "claude-3"')
     narrow_result = validate_policy_change(ml_team.id, "policies.ai.allowedModels", ["claude-3"])
-    print(f"   Result: {'✅ Allowed' if narrow_result['allowed'] else '❌ Blocked'}")
-    print()
+
+    _write(
+        _attempt("ML Team tries to disable GDPR compliance", gdpr_result)
+        + _attempt("ML Team tries to set encryption to 128 bits", encryption_result)
+        + _attempt("ML Team tries to set encryption to 512 bits", encryption512_result)
+        + _attempt('ML Team tries to add "llama-2" to allowed models', model_result)
+        + _attempt('ML Team narrows allowed models to just "claude-3"', narrow_result)
+    )
 
     # ============================================
     # 6. User's Effective Policies
     # ============================================
-    print("👤 Step 6: Computing Alice's effective policies...\n")
-
-    print("   Alice is a member of ML Team, which inherits from:")
-    print("   └── Engineering (department)")
-    print("       └── ACME Corp (organization)\n")
-
-    print("   Alice's effective policies:")
-    print("   ┌─────────────────────────────────────────────────────────┐")
-    print("   │ 🔐 GDPR Compliance: true (from ACME Corp, locked)       │")
-    print("   │ 🔐 Data Residency: EU (from ACME Corp, locked)          │")
-    print("   │ 🔐 Max Retention: 36 months (from ACME Corp, max)       │")
-    print("   │ 🔐 Min Encryption: 256 bits (from ACME Corp, min)       │")
-    print("   │ 🔐 Code Review: required (from Engineering, locked)     │")
-    print("   │ 🔐 CI Required: true (from Engineering, locked)         │")
-    print('   │ 📝 Allowed AI Models: ["claude-3"] (from ML Team)       │')
-    print("   │ 🔐 Experiment Tracking: true (from ML Team, locked)     │")
-    print("   └─────────────────────────────────────────────────────────┘\n")
+    _write(ALICE_POLICIES_10)
 
     # ============================================
     # 7. Entity Visualization
     # ============================================
-    print("🌳 Step 7: Entity Hierarchy Visualization\n")
-
-    print("   ┌─────────────────────────────────────────────────────────────┐")
-    print("   │                     ACME CORPORATION                        │")
-    print("   │        entityType: organization | depth: 0                  │")
-    print("   │   ENFORCES: gdpr, dataResidency, retention, encryption      │")
-    print("   └─────────────────────────────────┬───────────────────────────┘")
-    print("                                     │")
-    print("           ┌─────────────────────────┴─────────────────────┐")
-    print("           │                                               │")
-    print("   ┌───────▼───────┐                             ┌─────────▼─────────┐")
-    print("   │  ENGINEERING  │                             │      SALES        │")
-    print("   │   department  │                             │    department     │")
-    print("   │ +codeReview   │                             │                   │")
-    print("   │ +ciRequired   │                             │                   │")
-    print("   └───────┬───────┘                             └───────────────────┘")
-    print("           │")
-    print("   ┌───────┴───────┐")
-    print("   │               │")
-    print("┌──▼──┐        ┌───▼────┐")
-    print("│ ML  │        │Platform│")
-    print("│Team │        │ Team   │")
-    print("│     │        │        │")
-    print("│Alice│        │  Bob   │")
-    print("│ Bob │        │        │")
-    print("└─────┘        └────────┘")
-    print()
+    _write(TREE_10)
 
     # ============================================
     # Summary
     # ============================================
-    print("═══════════════════════════════════════════════════════════")
-    print("                    ✨ Example Complete!")
-    print("═══════════════════════════════════════════════════════════\n")
-    print("   Key takeaways:\n")
-    print("   1. Entities form hierarchies (org → dept → team → user)")
-    print("   2. Enforced policies flow down and cannot be overridden")
-    print("   3. Different enforcement types: locked, min, max, subset, additive")
-    print("   4. Users inherit effective policies from their entity chain")
-    print("   5. Policy validation prevents unauthorized changes")
-    print("   6. Flexible entity types: organization, department, team, project, etc.\n")
-
+    _write(SUMMARY_10)
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Tests for enforced policy validation in the entity hierarchy example
+"""
+
+from enum import IntEnum
+
+import pytest
+
+from main import (
+    EnforcedRule,
+    EntityProfile,
+    register_entity,
+    validate_policy_change,
+    validate_policy_changes_batch,
+)
+
+ORG_ID = "did:a2p:entity:local:test-org"
+TEAM_ID = "did:a2p:entity:local:test-team"
+MIN_BITS = "policies.security.encryption.minBits"
+MAX_MONTHS = "policies.data.retention.maxMonths"
+
+
+def _entity(entity_id, parent=None, rules=()):
+    return EntityProfile(
+        id=entity_id,
+        profile_type="entity",
+        display_name=entity_id.rsplit(":", 1)[-1],
+        entity_type="team" if parent else "organization",
+        description=None,
+        parent=parent,
+        children=(),
+        inherit_policies=parent is not None,
+        depth=1 if parent else 0,
+        enforced_rules=rules,
+        policies={},
+        direct_members=(),
+        admins=(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def hierarchy():
+    register_entity(
+        _entity(
+            ORG_ID,
+            rules=(
+                EnforcedRule("min-encryption", MIN_BITS, 256, "min", "Security baseline"),
+                EnforcedRule("max-retention", MAX_MONTHS, 36, "max", "Data minimization"),
+            ),
+        )
+    )
+    register_entity(_entity(TEAM_ID, parent=ORG_ID))
+
+
+class Bits(IntEnum):
+    LOW = 100
+
+
+class Months(float):
+    pass
+
+
+class TestNumericRules:
+    """Test min/max enforcement on numeric values"""
+
+    def test_int_enum_below_min_is_blocked(self):
+        """Test an IntEnum below a min rule is blocked"""
+        assert not validate_policy_change(TEAM_ID, MIN_BITS, Bits.LOW).allowed
+        assert not validate_policy_changes_batch(TEAM_ID, MIN_BITS, [Bits.LOW])[0].allowed
+
+    def test_float_subclass_below_min_is_blocked(self):
+        """Test a float subclass below a min rule is blocked"""
+        assert not validate_policy_change(TEAM_ID, MIN_BITS, Months(128.0)).allowed
+
+    def test_int_enum_above_max_is_blocked(self):
+        """Test an IntEnum above a max rule is blocked"""
+        assert not validate_policy_change(TEAM_ID, MAX_MONTHS, Bits.LOW).allowed
+
+    def test_value_within_bounds_is_allowed(self):
+        """Test values inside the bounds are allowed"""
+        assert validate_policy_change(TEAM_ID, MIN_BITS, 512).allowed
+        assert validate_policy_change(TEAM_ID, MAX_MONTHS, 12).allowed
+
+    def test_nan_is_allowed(self):
+        """Test NaN passes min/max rules in single and batch validation"""
+        nan = float("nan")
+        for path in (MIN_BITS, MAX_MONTHS):
+            result = validate_policy_change(TEAM_ID, path, nan)
+            assert result is not None and result.allowed
+            assert validate_policy_changes_batch(TEAM_ID, path, [nan])[0].allowed
+
+
+class TestSamePathRules:
+    """Test an entity enforcing both a min and a max on one path"""
+
+    @pytest.fixture(autouse=True)
+    def bounded(self):
+        register_entity(
+            _entity(
+                "did:a2p:entity:local:bounded-org",
+                rules=(
+                    EnforcedRule("min-months", "p.months", 6, "min", "Audit window"),
+                    EnforcedRule("max-months", "p.months", 36, "max", "Data minimization"),
+                ),
+            )
+        )
+        register_entity(
+            _entity("did:a2p:entity:local:bounded-team", parent="did:a2p:entity:local:bounded-org")
+        )
+
+    def test_both_bounds_are_enforced(self):
+        """Test values below the min and above the max are both blocked"""
+        team = "did:a2p:entity:local:bounded-team"
+        assert not validate_policy_change(team, "p.months", 1).allowed
+        assert not validate_policy_change(team, "p.months", 48).allowed
+        assert validate_policy_change(team, "p.months", 12).allowed
+
+    def test_batch_enforces_both_bounds(self):
+        """Test the batch path, including the vectorized one, checks both bounds"""
+        team = "did:a2p:entity:local:bounded-team"
+        for values in ([1, 12, 48], [1, 12, 48] * 20):
+            results = validate_policy_changes_batch(team, "p.months", values)
+            assert [r.allowed for r in results] == [v == 12 for v in values]
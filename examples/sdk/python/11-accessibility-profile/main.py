@@ -16,65 +16,82 @@ from a2p import (
 )
 
 
+# UI configuration used when no preference applies
+_UI_DEFAULTS: Dict[str, Any] = {
+    "colorPalette": "default",
+    "fontSize": "medium",
+    "animations": True,
+    "theme": "light",
+    "contrast": "normal",
+    "clickTargetSize": "normal",
+    "timeoutMultiplier": 1,
+    "lineSpacing": "normal",
+}
+
+# Color vision type → palette that keeps content distinguishable
+_CV_PALETTE: Dict[str, str] = {
+    "protanopia": "colorblind-safe-rg",
+    "deuteranopia": "colorblind-safe-rg",
+    "protanomaly": "colorblind-safe-rg",
+    "deuteranomaly": "colorblind-safe-rg",
+    "tritanopia": "colorblind-safe-by",
+    "tritanomaly": "colorblind-safe-by",
+    "achromatopsia": "high-contrast-patterns",
+}
+
+_PALETTE_NOTES: Dict[str, str] = {
+    "colorblind-safe-rg": "Using red/green colorblind-safe palette",
+    "colorblind-safe-by": "Using blue/yellow colorblind-safe palette",
+    "high-contrast-patterns": "Using patterns instead of colors",
+}
+
+
 def generate_adapted_ui(accessibility: AccessibilityPreferences) -> Dict[str, Any]:
     """Simulated generative UI adapter."""
-    adaptations = {
-        "colorPalette": "default",
-        "fontSize": "medium",
-        "animations": True,
-        "theme": "light",
-        "contrast": "normal",
-        "clickTargetSize": "normal",
-        "timeoutMultiplier": 1,
-        "lineSpacing": "normal",
-    }
+    adaptations = _UI_DEFAULTS.copy()
+    vision = accessibility.vision
+    motor = accessibility.motor
+    cognitive = accessibility.cognitive
 
     # Adapt for color vision
-    if accessibility.vision and accessibility.vision.color_vision:
-        cv_type = accessibility.vision.color_vision.get("type")
-        if cv_type in ["protanopia", "deuteranopia", "protanomaly", "deuteranomaly"]:
-            adaptations["colorPalette"] = "colorblind-safe-rg"
-            print("  → Using red/green colorblind-safe palette")
-        elif cv_type in ["tritanopia", "tritanomaly"]:
-            adaptations["colorPalette"] = "colorblind-safe-by"
-            print("  → Using blue/yellow colorblind-safe palette")
-        elif cv_type == "achromatopsia":
-            adaptations["colorPalette"] = "high-contrast-patterns"
-            print("  → Using patterns instead of colors")
+    if vision and vision.color_vision:
+        palette = _CV_PALETTE.get(vision.color_vision.get("type"))
+        if palette:
+            adaptations["colorPalette"] = palette
+            print(f"  → {_PALETTE_NOTES[palette]}")
 
     # Adapt font size
-    if accessibility.vision and accessibility.vision.font_size:
-        adaptations["fontSize"] = accessibility.vision.font_size
+    if vision and vision.font_size:
+        adaptations["fontSize"] = vision.font_size
         print(f"  → Font size: {adaptations['fontSize']}")
 
     # Adapt for reduced motion
-    if (accessibility.vision and accessibility.vision.reduced_motion) or \
-       (accessibility.cognitive and accessibility.cognitive.reduced_animations):
+    if (vision and vision.reduced_motion) or (cognitive and cognitive.reduced_animations):
         adaptations["animations"] = False
         print("  → Animations disabled")
 
     # Adapt theme
-    if accessibility.vision and accessibility.vision.prefers_dark_mode:
+    if vision and vision.prefers_dark_mode:
         adaptations["theme"] = "dark"
         print("  → Using dark theme")
 
     # Adapt contrast
-    if accessibility.vision and accessibility.vision.high_contrast:
-        adaptations["contrast"] = accessibility.vision.high_contrast
+    if vision and vision.high_contrast:
+        adaptations["contrast"] = vision.high_contrast
         print(f"  → Contrast: {adaptations['contrast']}")
 
     # Adapt for motor accessibility
-    if accessibility.motor and accessibility.motor.large_click_targets:
+    if motor and motor.large_click_targets:
         adaptations["clickTargetSize"] = "large"
         print("  → Using large click targets (44x44px minimum)")
 
-    if accessibility.motor and accessibility.motor.extended_timeouts:
+    if motor and motor.extended_timeouts:
         adaptations["timeoutMultiplier"] = 3
         print("  → Timeouts extended 3x")
 
     # Adapt for cognitive accessibility
-    if accessibility.cognitive and accessibility.cognitive.reading_assistance:
-        line_spacing = accessibility.cognitive.reading_assistance.get("lineSpacing")
+    if cognitive and cognitive.reading_assistance:
+        line_spacing = cognitive.reading_assistance.get("lineSpacing")
         if line_spacing:
             adaptations["lineSpacing"] = line_spacing
             print(f"  → Line spacing: {adaptations['lineSpacing']}")
@@ -82,6 +99,13 @@ def generate_adapted_ui(accessibility: AccessibilityPreferences) -> Dict[str, An
     return adaptations
 
 
+# Allergy warning per severity; anything else is listed as "<allergen> (<severity>)"
+_ALLERGY_WARNINGS: Dict[str, str] = {
+    "anaphylactic": "⚠️ SEVERE: {a} (ANAPHYLACTIC - carries EpiPen)",
+    "severe": "⚠️ SEVERE: {a}",
+}
+
+
 def prepare_restaurant_reservation(physical: PhysicalAccessibility) -> Dict[str, List[str]]:
     """Simulated restaurant reservation system."""
     reservation = {
@@ -93,14 +117,11 @@ def prepare_restaurant_reservation(physical: PhysicalAccessibility) -> Dict[str,
 
     # Process allergies - CRITICAL for safety
     if physical.allergies and physical.allergies.food:
+        severity_map = physical.allergies.severity or {}
         for allergen in physical.allergies.food:
-            severity = physical.allergies.severity.get(allergen, "unknown") if physical.allergies.severity else "unknown"
-            if severity == "anaphylactic":
-                reservation["allergyWarnings"].append(f"⚠️ SEVERE: {allergen} (ANAPHYLACTIC - carries EpiPen)")
-            elif severity == "severe":
-                reservation["allergyWarnings"].append(f"⚠️ SEVERE: {allergen}")
-            else:
-                reservation["allergyWarnings"].append(f"{allergen} ({severity})")
+            severity = severity_map.get(allergen, "unknown")
+            template = _ALLERGY_WARNINGS.get(severity, "{a} ({s})")
+            reservation["allergyWarnings"].append(template.format(a=allergen, s=severity))
         print(f"  → Food allergies flagged: {', '.join(physical.allergies.food)}")
 
     # Process dietary restrictions
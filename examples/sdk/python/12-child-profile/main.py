@@ -10,6 +10,9 @@ Demonstrates how to create and manage a child's profile with:
 """
 
 import asyncio
+import sys
+from functools import lru_cache
+from itertools import starmap
 from a2p import (
     A2PClient,
     A2PUserClient,
@@ -21,15 +24,105 @@ from a2p import (
 )
 
 
+_YN = {True: "Yes", False: "No"}
+
+# Policies the guardian locks on the child profile: (field, value, reason)
+_ENFORCED_POLICIES = (
+    ("contentSafety.filterExplicitContent", True, "Age-appropriate content"),
+    ("contentSafety.filterViolence", True, "Violence protection"),
+    ("chatRestrictions.allowStrangers", False, "Safety: no strangers"),
+    ("purchaseControls.requireApproval", True, "Parent approval for purchases"),
+    ("screenTime.dailyLimit", "2h", "Screen time limit"),
+    ("screenTime.bedtime", "20:00", "Digital bedtime"),
+)
+
+_ENFORCED_POLICY_LINES: tuple[str, ...] = tuple(
+    f"   - {field} = {value}\n     Reason: {reason}" for field, value, reason in _ENFORCED_POLICIES
+)
+
+_BOX_TOP = "   ┌─────────────────────────────────────────────┐"
+_BOX_RULE = "   ├─────────────────────────────────────────────┤"
+_BOX_BOTTOM = "   └─────────────────────────────────────────────┘"
+
+# Top border, title row and separator of each box
+_CONTENT_SAFETY_HEAD = (_BOX_TOP, "   │           CONTENT SAFETY                     │", _BOX_RULE)
+_PARENTAL_CONTROLS_HEAD = (_BOX_TOP, "   │           PARENTAL CONTROLS                  │", _BOX_RULE)
+_GUARDIAN_HEAD = (_BOX_TOP, "   │        GUARDIAN CAPABILITIES                 │", _BOX_RULE)
+
+
+# One boxed "label: value" row; the label column is 22 wide, the value 21
+_ROW = "   │ {0:<22}{1:<21}│".format
+
+
+def _content_safety_box(content_safety: ContentSafety) -> list[str]:
+    chat = content_safety.chat_restrictions or {}
+    rows = (
+        ("Age Group:", content_safety.age_group or ""),
+        ("Maturity Rating:", content_safety.maturity_rating or ""),
+        ("Filter Explicit:", _YN[bool(content_safety.filter_explicit_content)]),
+        ("Filter Violence:", _YN[bool(content_safety.filter_violence)]),
+        ("Filter Scary:", _YN[bool(content_safety.filter_scary_content)]),
+        ("Safe Search:", content_safety.safe_search or ""),
+        ("Allow Strangers:", _YN[bool(chat.get("allowStrangers", False))]),
+        ("Moderated Chats:", _YN[bool(chat.get("moderatedChats", False))]),
+    )
+    return [
+        *_CONTENT_SAFETY_HEAD,
+        *starmap(_ROW, rows),
+        _BOX_BOTTOM,
+        "",
+    ]
+
+
+def _parental_controls_box(content_safety: ContentSafety) -> list[str]:
+    screen_time = content_safety.screen_time or {}
+    purchases = content_safety.purchase_controls or {}
+    screen_rows = (
+        ("Screen Time Enabled:", _YN[bool(screen_time.get("enabled", False))]),
+        ("Daily Limit:", screen_time.get("dailyLimit", "None")),
+        ("Bedtime:", screen_time.get("bedtime", "Not set")),
+        ("Break Reminders:", _YN[bool(screen_time.get("breakReminders", False))]),
+    )
+    purchase_rows = (
+        ("Purchase Approval:", "Required" if purchases.get("requireApproval", False) else "No"),
+        ("Spending Limit:", f"€{purchases.get('spendingLimit', 0)}"),
+    )
+    return [
+        *_PARENTAL_CONTROLS_HEAD,
+        *starmap(_ROW, screen_rows),
+        _BOX_RULE,
+        *starmap(_ROW, purchase_rows),
+        _BOX_BOTTOM,
+        "",
+    ]
+
+
+@lru_cache(maxsize=None)
+def _format_perm(perm: str) -> str:
+    return f"   │ ✓ {perm.replace('_', ' ').ljust(41)}│"
+
+
+def _guardian_box(permissions: list[str]) -> list[str]:
+    return [
+        *_GUARDIAN_HEAD,
+        *map(_format_perm, permissions),
+        _BOX_BOTTOM,
+        "",
+    ]
+
+
 async def main():
-    print("=== a2p Child Profile Example ===\n")
+    # Output is collected here and written once at the end
+    out: list[str] = []
+
+    out.append("=== a2p Child Profile Example ===\n")
 
     storage = MemoryStorage()
 
     # ============================================
     # Step 1: Parent creates their profile
     # ============================================
-    print("1. Parent (Alice) creates their profile...\n")
+    out.append("1. Parent (Alice) creates their profile...\n")
 
     parent_client = A2PUserClient(storage)
     parent_profile = await parent_client.create_profile(
@@ -40,13 +133,13 @@ async def main():
         }
     )
 
-    print(f"   Parent profile created: {parent_profile.id}")
-    print()
+    out.append(f"   Parent profile created: {parent_profile.id}")
+    out.append("")
 
     # ============================================
     # Step 2: Parent creates child's profile
     # ============================================
-    print("2. Parent creates child profile with guardianship...\n")
+    out.append("2. Parent creates child profile with guardianship...\n")
 
     # Age context
     age_context = AgeContext(
@@ -99,128 +192,80 @@ async def main():
 
     child_display_name = "Jamie"
 
-    print("   Child profile settings:")
-    print(f"   - Name: {child_display_name}")
-    print(f"   - Age group: {age_context.age_group} ({age_context.age_range})")
-    print(f"   - Jurisdiction: {age_context.jurisdiction} (consent age: {age_context.digital_age_of_consent})")
-    print(f"   - Primary guardian: {guardianship.managed_by}")
-    print()
+    out.append("   Child profile settings:")
+    out.append(f"   - Name: {child_display_name}")
+    out.append(f"   - Age group: {age_context.age_group} ({age_context.age_range})")
+    out.append(f"   - Jurisdiction: {age_context.jurisdiction} (consent age: {age_context.digital_age_of_consent})")
+    out.append(f"   - Primary guardian: {guardianship.managed_by}")
+    out.append("")
 
     # ============================================
     # Step 3: Show content safety settings
     # ============================================
-    print("3. Content safety settings:\n")
-
-    print("   ┌─────────────────────────────────────────────┐")
-    print("   │           CONTENT SAFETY                     │")
-    print("   ├─────────────────────────────────────────────┤")
-    print(f"   │ Age Group:            {(content_safety.age_group or '').ljust(21)}│")
-    print(f"   │ Maturity Rating:      {(content_safety.maturity_rating or '').ljust(21)}│")
-    print(f"   │ Filter Explicit:      {('Yes' if content_safety.filter_explicit_content else 'No').ljust(21)}│")
-    print(f"   │ Filter Violence:      {('Yes' if content_safety.filter_violence else 'No').ljust(21)}│")
-    print(f"   │ Filter Scary:         {('Yes' if content_safety.filter_scary_content else 'No').ljust(21)}│")
-    print(f"   │ Safe Search:          {(content_safety.safe_search or '').ljust(21)}│")
-    chat_allow = content_safety.chat_restrictions.get("allowStrangers", False) if content_safety.chat_restrictions else False
-    chat_mod = content_safety.chat_restrictions.get("moderatedChats", False) if content_safety.chat_restrictions else False
-    print(f"   │ Allow Strangers:      {('Yes' if chat_allow else 'No').ljust(21)}│")
-    print(f"   │ Moderated Chats:      {('Yes' if chat_mod else 'No').ljust(21)}│")
-    print("   └─────────────────────────────────────────────┘")
-    print()
+    out.append("3. Content safety settings:\n")
+
+    out.extend(_content_safety_box(content_safety))
 
     # ============================================
     # Step 4: Show screen time settings
     # ============================================
-    print("4. Screen time and purchase controls:\n")
-
-    screen_enabled = content_safety.screen_time.get("enabled", False) if content_safety.screen_time else False
-    daily_limit = content_safety.screen_time.get("dailyLimit", "None") if content_safety.screen_time else "None"
-    bedtime = content_safety.screen_time.get("bedtime", "Not set") if content_safety.screen_time else "Not set"
-    break_rem = content_safety.screen_time.get("breakReminders", False) if content_safety.screen_time else False
-    purchase_approval = content_safety.purchase_controls.get("requireApproval", False) if content_safety.purchase_controls else False
-    spending = content_safety.purchase_controls.get("spendingLimit", 0) if content_safety.purchase_controls else 0
-
-    print("   ┌─────────────────────────────────────────────┐")
-    print("   │           PARENTAL CONTROLS                  │")
-    print("   ├─────────────────────────────────────────────┤")
-    print(f"   │ Screen Time Enabled:  {('Yes' if screen_enabled else 'No').ljust(21)}│")
-    print(f"   │ Daily Limit:          {daily_limit.ljust(21)}│")
-    print(f"   │ Bedtime:              {bedtime.ljust(21)}│")
-    print(f"   │ Break Reminders:      {('Yes' if break_rem else 'No').ljust(21)}│")
-    print("   ├─────────────────────────────────────────────┤")
-    print(f"   │ Purchase Approval:    {('Required' if purchase_approval else 'No').ljust(21)}│")
-    print(f"   │ Spending Limit:       {('€' + str(spending)).ljust(21)}│")
-    print("   └─────────────────────────────────────────────┘")
-    print()
+    out.append("4. Screen time and purchase controls:\n")
+
+    out.extend(_parental_controls_box(content_safety))
 
     # ============================================
     # Step 5: Simulate agent access request
     # ============================================
-    print("5. Agent requests access to child profile...\n")
+    out.append("5. Agent requests access to child profile...\n")
 
     agent_client = A2PClient(
         agent_did="did:a2p:agent:local:educational-game",
         storage=storage,
     )
 
-    print("   Agent: did:a2p:agent:local:educational-game")
-    print("   Requested scopes: [a2p:preferences, a2p:interests]")
-    print()
+    out.append("   Agent: did:a2p:agent:local:educational-game")
+    out.append("   Requested scopes: [a2p:preferences, a2p:interests]")
+    out.append("")
 
     # Simulated access check
     is_minor = age_context.consent_status == "parental_consent"
     requires_guardian_approval = is_minor
 
-    print("   ⚠️  MINOR PROFILE DETECTED")
-    print(f"   → Consent status: {age_context.consent_status}")
-    print(f"   → Guardian approval required: {'Yes' if requires_guardian_approval else 'No'}")
-    print(f"   → Primary guardian: {guardianship.managed_by}")
-    print()
+    out.append("   ⚠️  MINOR PROFILE DETECTED")
+    out.append(f"   → Consent status: {age_context.consent_status}")
+    out.append(f"   → Guardian approval required: {_YN[requires_guardian_approval]}")
+    out.append(f"   → Primary guardian: {guardianship.managed_by}")
+    out.append("")
 
     # ============================================
     # Step 6: Show enforced policies
     # ============================================
-    print("6. Enforced policies (child cannot override):\n")
-
-    enforced_policies = [
-        {"field": "contentSafety.filterExplicitContent", "value": True, "reason": "Age-appropriate content"},
-        {"field": "contentSafety.filterViolence", "value": True, "reason": "Violence protection"},
-        {"field": "chatRestrictions.allowStrangers", "value": False, "reason": "Safety: no strangers"},
-        {"field": "purchaseControls.requireApproval", "value": True, "reason": "Parent approval for purchases"},
-        {"field": "screenTime.dailyLimit", "value": "2h", "reason": "Screen time limit"},
-        {"field": "screenTime.bedtime", "value": "20:00", "reason": "Digital bedtime"},
-    ]
+    out.append("6. Enforced policies (child cannot override):\n")
 
-    print("   🔒 LOCKED BY GUARDIAN:")
-    for policy in enforced_policies:
-        print(f"   - {policy['field']} = {policy['value']}")
-        print(f"     Reason: {policy['reason']}")
-    print()
+    out.append("   🔒 LOCKED BY GUARDIAN:")
+    out.extend(_ENFORCED_POLICY_LINES)
+    out.append("")
 
     # ============================================
     # Step 7: Legal compliance
     # ============================================
-    print("7. Legal compliance:\n")
+    out.append("7. Legal compliance:\n")
 
-    print("   ✅ COPPA (US) - Children under 13: Parental consent required")
-    print("   ✅ GDPR Article 8 (EU) - Digital consent age varies by country")
-    print(f"   ✅ LOPDGDD (Spain) - Age {age_context.digital_age_of_consent} for digital consent")
-    print("   ✅ Content filtering aligned with age group")
-    print()
+    out.append("   ✅ COPPA (US) - Children under 13: Parental consent required")
+    out.append("   ✅ GDPR Article 8 (EU) - Digital consent age varies by country")
+    out.append(f"   ✅ LOPDGDD (Spain) - Age {age_context.digital_age_of_consent} for digital consent")
+    out.append("   ✅ Content filtering aligned with age group")
+    out.append("")
 
     # ============================================
     # Step 8: Guardian permissions summary
     # ============================================
-    print("8. Guardian permissions:\n")
+    out.append("8. Guardian permissions:\n")
 
-    print("   ┌─────────────────────────────────────────────┐")
-    print("   │        GUARDIAN CAPABILITIES                 │")
-    print("   ├─────────────────────────────────────────────┤")
-    for perm in guardian.permissions:
-        print(f"   │ ✓ {perm.replace('_', ' ').ljust(41)}│")
-    print("   └─────────────────────────────────────────────┘")
-    print()
+    out.extend(_guardian_box(guardian.permissions))
 
-    print("=== Child Profile Example Complete ===\n")
+    out.append("=== Child Profile Example Complete ===\n")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+"""
+Run the ML recommender (08) and IoT smart home (09) examples together.
+
+Both examples share one event loop and run concurrently, so the total
+time is roughly that of the slower one. Each keeps its own storage;
+their console output interleaves step by step.
+
+Usage:
+    python run_all.py
+"""
+
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+
+EXAMPLES_DIR = Path(__file__).resolve().parent
+EXAMPLES = ("08-ml-recommender", "09-iot-smart-home")
+
+
+def load_example(name: str):
+    """Import an example's main.py (its directory name is not a valid module name)"""
+    example_dir = EXAMPLES_DIR / name
+    # Examples may import helper modules that sit next to main.py
+    sys.path.insert(0, str(example_dir))
+    spec = importlib.util.spec_from_file_location(f"example_{name[:2]}", example_dir / "main.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def run_all() -> None:
+    examples = [load_example(name) for name in EXAMPLES]
+    await asyncio.gather(*(example.run_example() for example in examples))
+
+
+if __name__ == "__main__":
+    asyncio.run(run_all())
@@ -17,6 +17,14 @@ import asyncio
 from a2p import A2PClient
 from a2p.storage.cloud import CloudStorage
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (and unavailable on Windows)
+    uvloop = None
+
+
+_MEMORY_CATEGORIES = ("semantic", "episodic", "procedural")
+
 
 async def main():
     # Configuration from environment
@@ -71,14 +79,13 @@ async def main():
         # Show existing memories count
         memory_count = 0
         if profile.memories:
-            for category in ["semantic", "episodic", "procedural"]:
-                memories = getattr(profile.memories, category, [])
-                if memories:
-                    memory_count += len(memories)
+            memory_count = sum(
+                len(getattr(profile.memories, c, None) or ()) for c in _MEMORY_CATEGORIES
+            )
         print(f"   Memories: {memory_count}")
         print()
 
-        # Step 2: Propose a new memory
+        # Step 2: Propose a new memory, only once the profile is known to exist
         print("💡 Proposing a new memory...")
 
         proposal_result = await client.propose_memory(
@@ -108,4 +115,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
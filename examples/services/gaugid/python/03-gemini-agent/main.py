@@ -14,14 +14,88 @@ Prerequisites:
 """
 
 import os
+import re
+import sys
 import json
 import asyncio
-from typing import Optional
+from collections import OrderedDict
+from hashlib import blake2b
+from itertools import chain
+from typing import Callable, Optional
+
 from google import genai
 from google.genai import types
 from a2p import A2PClient
 from a2p.storage.cloud import CloudStorage
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (and unavailable on Windows)
+    uvloop = None
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
+
+# JSON wrapped in a markdown code block, with or without a "json" tag
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+_MEMORY_CATEGORIES = ("semantic", "episodic", "procedural")
+
+# Pending proposal batches beyond this drop the oldest; workers run them concurrently
+ANALYSIS_QUEUE_SIZE = 8
+ANALYSIS_WORKERS = 2
+
+# Most recent memory contents remembered to avoid proposing them twice
+PROPOSAL_HISTORY_SIZE = 4096
+
+# Output token budgets; the memories JSON follows the reply in the same
+# response, so it gets room of its own instead of whatever the reply leaves
+REPLY_MAX_TOKENS = 1024
+MEMORIES_MAX_TOKENS = 1024
+
+
+def _content_key(content: str) -> bytes:
+    """Short fingerprint of a memory's normalized content"""
+    return blake2b(content.strip().lower().encode(), digest_size=8).digest()
+
+
+def _is_informative(message: str) -> bool:
+    """Cheap check that a message could reveal something worth remembering"""
+    return len(message) >= 8 and any(len(word) >= 4 and word.isalpha() for word in message.split())
+
+
+# Separates the reply from the memories JSON in Gemini's response
+_MEMORY_MARKER = "<<<MEMORIES>>>"
+
+# Prompt scaffold; only the user context changes between sessions
+_SYSTEM_PROMPT = """You are a helpful AI assistant with knowledge about the user from their a2p profile.
+
+User Profile Context:
+{context}
+
+Guidelines:
+1. Use the user context to personalize your responses
+2. Be helpful and friendly
+3. If the user shares new information about themselves, acknowledge it
+4. Keep responses concise but informative
+
+Respond to the user's message naturally.
+
+After your reply, write {marker} on its own line, followed by a JSON array of
+memories to propose if the user revealed any NEW information about themselves
+(preferences, facts, experiences). Each memory should have:
+- content: What to remember (string)
+- category: One of "a2p:preferences", "a2p:interests", "a2p:professional", "a2p:episodic"
+- confidence: How confident (0.5 to 1.0)
+
+If nothing new was revealed, write an empty array: []
+
+Only propose genuinely new information, not things already known.
+Write ONLY valid JSON after {marker}, no markdown.""".format
+
 
 class GaugidGeminiAgent:
     """AI Agent powered by Gemini with Gaugid profile storage"""
@@ -54,14 +128,51 @@ class GaugidGeminiAgent:
         # Current user context
         self.current_user_did: Optional[str] = None
         self.user_context: str = ""
+        # Prompt text derived from user_context, rebuilt by _set_user_context
+        self._system_prompt: str = ""
+
+        # Fingerprints of memories the current user has or was proposed
+        self._seen_proposals: OrderedDict[bytes, None] = OrderedDict()
+
+        # Per user: profile ETag, the context built from it and the
+        # fingerprints of its memories, reused while the profile is unchanged
+        self._context_cache: dict[str, tuple[str, str, tuple[bytes, ...]]] = {}
+
+        # Background memory proposals: (user message, memories JSON) pairs
+        # waiting for a worker; workers start with the first chat
+        self._analysis_queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue(
+            maxsize=ANALYSIS_QUEUE_SIZE
+        )
+        self._analysis_workers: list[asyncio.Task] = []
+
+        # Set once a Gemini request has opened the connection
+        self._gemini_warm = False
 
     async def load_user_context(self, user_did: str) -> str:
         """Load user profile and build context string for Gemini"""
         self.current_user_did = user_did
-
-        profile = await self.a2p_client.get_profile(user_did)
+        self._seen_proposals.clear()
+
+        # Open the Gemini connection while Gaugid serves the profile, so the
+        # first chat doesn't pay for the TLS handshake after the fetch
+        if self._gemini_warm:
+            profile = await self.a2p_client.get_profile(user_did)
+        else:
+            profile, _ = await asyncio.gather(
+                self.a2p_client.get_profile(user_did),
+                self._warm_up_gemini(),
+            )
         if not profile:
-            self.user_context = "No profile available."
+            self._set_user_context("No profile available.")
+            return self.user_context
+
+        # CloudStorage revalidates with If-None-Match; an unchanged ETag
+        # means the context built last time still holds
+        etag = self.storage.get_etag(user_did)
+        cached = self._context_cache.get(user_did)
+        if etag is not None and cached is not None and cached[0] == etag:
+            self._seen_proposals.update(dict.fromkeys(cached[2]))
+            self._set_user_context(cached[1])
             return self.user_context
 
         context_parts = []
@@ -81,134 +192,207 @@ class GaugidGeminiAgent:
 
         # Memories
         if profile.memories:
-            memories_list = []
-            for category in ["semantic", "episodic", "procedural"]:
-                memories = getattr(profile.memories, category, [])
-                if memories:
-                    for mem in memories[:5]:  # Limit to 5 per category
-                        memories_list.append(f"- {mem.content}")
+            by_category = [getattr(profile.memories, c, None) or () for c in _MEMORY_CATEGORIES]
+            # Limit to 5 per category
+            memories_list = [
+                f"- {mem.content}" for mem in chain.from_iterable(m[:5] for m in by_category)
+            ]
+            # Never propose what the profile already holds
+            for mem in chain.from_iterable(by_category):
+                self._seen_proposals[_content_key(mem.content)] = None
 
             if memories_list:
                 context_parts.append("Known about user:\n" + "\n".join(memories_list))
 
-        self.user_context = "\n".join(context_parts) if context_parts else "New user, no history."
+        self._set_user_context("\n".join(context_parts) if context_parts else "New user, no history.")
+        if etag is not None:
+            self._context_cache[user_did] = (etag, self.user_context, tuple(self._seen_proposals))
         return self.user_context
 
-    async def chat(self, user_message: str) -> str:
+    async def _warm_up_gemini(self) -> None:
+        """Make a cheap Gemini request to set up the connection ahead of chat"""
+        try:
+            await self.gemini.aio.models.list()
+            self._gemini_warm = True
+        except Exception:
+            pass  # chat() will connect (and report errors) on its own
+
+    def _set_user_context(self, context: str) -> None:
+        """Store the user context and the prompt text built from it"""
+        self.user_context = context
+        self._system_prompt = _SYSTEM_PROMPT(context=context, marker=_MEMORY_MARKER)
+
+    async def chat(
+        self,
+        user_message: str,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> str:
         """
         Process a user message and generate a response.
 
-        Also analyzes the conversation for potential memories to propose.
+        The response is streamed; if given, on_text receives each piece of the
+        reply as it arrives. The same response carries the memories Gemini
+        suggests proposing, which are handed to the background workers.
         """
         if not self.current_user_did:
             return "Error: No user loaded. Call load_user_context first."
 
-        # Build prompt with user context
-        system_prompt = f"""You are a helpful AI assistant with knowledge about the user from their a2p profile.
-
-User Profile Context:
-{self.user_context}
-
-Guidelines:
-1. Use the user context to personalize your responses
-2. Be helpful and friendly
-3. If the user shares new information about themselves, acknowledge it
-4. Keep responses concise but informative
-
-Respond to the user's message naturally."""
-
-        # Generate response with Gemini
-        response = self.gemini.models.generate_content(
+        # Stream the response from Gemini; the async client keeps the event loop
+        # free (e.g. for a previous turn's memory proposals) during the request
+        stream = await self.gemini.aio.models.generate_content_stream(
             model="gemini-2.0-flash",
             contents=[
-                types.Content(role="user", parts=[types.Part(text=system_prompt)]),
+                types.Content(role="user", parts=[types.Part(text=self._system_prompt)]),
                 types.Content(role="user", parts=[types.Part(text=user_message)]),
             ],
             config=types.GenerateContentConfig(
                 temperature=0.7,
-                max_output_tokens=1024,
+                max_output_tokens=REPLY_MAX_TOKENS + MEMORIES_MAX_TOKENS,
             ),
         )
 
-        assistant_response = response.text
-
-        # Analyze conversation for memory proposals (async, don't block)
-        asyncio.create_task(
-            self._analyze_for_memories(user_message, assistant_response)
-        )
+        # Everything before the marker is the reply, everything after it the
+        # memories JSON. The last few characters of the reply are held back
+        # until it is clear they don't begin a marker split across chunks.
+        reply_parts = []
+        memory_parts = None
+        pending = ""
+        async for chunk in stream:
+            if not chunk.text:
+                continue
+            if memory_parts is not None:
+                memory_parts.append(chunk.text)
+                continue
+            text, marker, rest = (pending + chunk.text).partition(_MEMORY_MARKER)
+            if marker:
+                memory_parts = [rest]
+                pending = ""
+            else:
+                keep = max(len(text) - len(_MEMORY_MARKER) + 1, 0)
+                text, pending = text[:keep], text[keep:]
+            if text:
+                reply_parts.append(text)
+                if on_text:
+                    on_text(text)
+        if pending:
+            reply_parts.append(pending)
+            if on_text:
+                on_text(pending)
+        assistant_response = "".join(reply_parts).rstrip()
+
+        # Propose suggested memories in the background (don't block).
+        # Short or wordless messages ("hi", "ok", "thx!") are skipped. A
+        # missing memories block is queued too, so the worker can report it.
+        if _is_informative(user_message):
+            memories_text = "".join(memory_parts) if memory_parts is not None else None
+            self._queue_analysis(self.current_user_did, user_message, memories_text)
 
         return assistant_response
 
-    async def _analyze_for_memories(self, user_message: str, assistant_response: str):
-        """Analyze conversation and propose relevant memories"""
-        if not self.current_user_did:
+    async def _propose_memories(
+        self, user_did: str, user_message: str, memories_text: Optional[str]
+    ):
+        """Propose the memories Gemini suggested alongside its reply to user_did"""
+        if memories_text is None:
+            print(f"  ⚠️ No memories in Gemini's response (missing {_MEMORY_MARKER} marker)")
             return
 
-        analysis_prompt = f"""Analyze this conversation for information worth remembering about the user.
-
-User said: "{user_message}"
-Assistant responded: "{assistant_response}"
-
-Current user context:
-{self.user_context}
-
-If the user revealed any NEW information about themselves (preferences, facts, experiences),
-respond with a JSON array of memories to propose. Each memory should have:
-- content: What to remember (string)
-- category: One of "a2p:preferences", "a2p:interests", "a2p:professional", "a2p:episodic"
-- confidence: How confident (0.5 to 1.0)
-
-If nothing new was revealed, respond with an empty array: []
-
-Only propose genuinely new information, not things already known.
-Respond ONLY with valid JSON, no markdown."""
-
         try:
-            response = self.gemini.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=analysis_prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.3,  # Lower temperature for more consistent JSON
-                ),
-            )
-
-            response_text = response.text.strip()
-
             # Handle markdown code blocks
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
-            proposals = json.loads(response_text)
+            fenced = _JSON_FENCE_RE.search(memories_text)
+            response_text = fenced.group(1) if fenced else memories_text.strip()
 
-            if not proposals:
-                return
+            proposals = _json_loads(response_text)
 
-            # Propose each memory
+            # Drop anything already in the profile or proposed earlier. The
+            # history belongs to the loaded user; a turn queued before
+            # load_user_context() switched users must not touch it.
+            seen = self._seen_proposals if user_did == self.current_user_did else OrderedDict()
+            fresh = []
             for proposal in proposals:
-                try:
-                    result = await self.a2p_client.propose_memory(
-                        user_did=self.current_user_did,
+                key = _content_key(proposal["content"])
+                if key not in seen:
+                    seen[key] = None
+                    fresh.append((key, proposal))
+            while len(seen) > PROPOSAL_HISTORY_SIZE:
+                seen.popitem(last=False)
+
+            if not fresh:
+                return
+            proposals = [proposal for _, proposal in fresh]
+
+            # Propose all memories at once; one failure doesn't stop the rest
+            context = f"From conversation: {user_message[:100]}"
+            results = await asyncio.gather(
+                *[
+                    self.a2p_client.propose_memory(
+                        user_did=user_did,
                         content=proposal["content"],
                         category=proposal.get("category", "a2p:episodic"),
                         confidence=proposal.get("confidence", 0.7),
-                        context=f"From conversation: {user_message[:100]}",
+                        context=context,
                     )
+                    for proposal in proposals
+                ],
+                return_exceptions=True,
+            )
+            for (key, proposal), result in zip(fresh, results):
+                if isinstance(result, BaseException):
+                    # Let a later turn try this one again
+                    seen.pop(key, None)
+                    print(f"  ⚠️ Failed to propose: {result}")
+                else:
                     print(f"  📝 Proposed memory: {proposal['content'][:50]}...")
-                except Exception as e:
-                    print(f"  ⚠️ Failed to propose: {e}")
 
-        except json.JSONDecodeError:
-            pass  # No valid memories to propose
+        except json.JSONDecodeError as e:
+            # Usually the response ran out of tokens partway through the JSON
+            print(f"  ⚠️ Could not parse suggested memories: {e}")
         except Exception as e:
-            print(f"  ⚠️ Memory analysis error: {e}")
+            print(f"  ⚠️ Memory proposal error: {e}")
+
+    def _queue_analysis(
+        self, user_did: str, user_message: str, memories_text: Optional[str]
+    ) -> None:
+        """Hand a turn's memories to the workers, dropping the oldest if full"""
+        if not self._analysis_workers:
+            self._analysis_workers = [
+                asyncio.create_task(self._analysis_worker()) for _ in range(ANALYSIS_WORKERS)
+            ]
+
+        # The user is captured now; by the time a worker gets to the item,
+        # load_user_context() may have switched to someone else
+        item = (user_did, user_message, memories_text)
+        try:
+            self._analysis_queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._analysis_queue.get_nowait()
+            self._analysis_queue.task_done()
+            self._analysis_queue.put_nowait(item)
+
+    async def _analysis_worker(self):
+        """Submit queued memory proposals one turn at a time"""
+        while True:
+            user_did, user_message, memories_text = await self._analysis_queue.get()
+            try:
+                await self._propose_memories(user_did, user_message, memories_text)
+            finally:
+                self._analysis_queue.task_done()
 
     async def close(self):
         """Cleanup resources"""
+        # Let pending proposals finish before the storage goes away
+        await self._analysis_queue.join()
+        for worker in self._analysis_workers:
+            worker.cancel()
+        await asyncio.gather(*self._analysis_workers, return_exceptions=True)
         await self.storage.close()
 
 
+def _echo(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
 async def main():
     # Configuration from environment
     api_url = os.environ.get("GAUGID_API_URL", "https://api.gaugid.com")
@@ -260,7 +444,9 @@ async def main():
 
         while True:
             try:
-                user_input = input("You: ").strip()
+                # Read in a worker thread so background memory analysis keeps
+                # running while waiting for the user
+                user_input = (await asyncio.to_thread(input, "You: ")).strip()
 
                 if not user_input:
                     continue
@@ -268,8 +454,9 @@ async def main():
                 if user_input.lower() in ("quit", "exit", "q"):
                     break
 
-                response = await agent.chat(user_input)
-                print(f"\nAgent: {response}\n")
+                print("\nAgent: ", end="", flush=True)
+                await agent.chat(user_input, on_text=_echo)
+                print("\n")
 
             except EOFError:
                 break
@@ -283,4 +470,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -15,13 +15,43 @@ Prerequisites:
 """
 
 import os
+import re
+import sys
+import time
 import asyncio
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
+
+import httpx
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 from a2p import A2PClient
-from a2p.storage.cloud import CloudStorage
+from a2p.storage.cloud import DEFAULT_LIMITS, CloudStorage
+from a2p.types import Profile
+
+
+# Routing keywords, matched anywhere in the message (case-insensitive); each
+# group is named after the role it routes to, and the first keyword found wins
+_ROUTE_RE = re.compile(
+    r"(?P<scheduler>schedule|meeting|calendar|time|appointment)"
+    r"|(?P<research>research|find|search|learn about|explain)",
+    re.IGNORECASE,
+)
+
+MODEL = "gemini-2.0-flash"
+
+# Lifetime in seconds of an agent's cached prompt on Gemini's side; a cache
+# is recreated once less than PROMPT_CACHE_MARGIN of it is left
+PROMPT_CACHE_TTL = 3600
+PROMPT_CACHE_MARGIN = 60
+
+# Gemini refuses to cache prompts shorter than this many tokens (roughly 16k
+# characters). The prompts in this demo are far shorter, so they are always
+# sent inline; the cache path only runs once a profile context grows past it.
+MIN_CACHE_TOKENS = 4096
+
+# Seconds a loaded user context is reused before the profile is fetched again
+PROFILE_CACHE_TTL = 300.0
 
 
 @dataclass
@@ -80,41 +110,92 @@ class MultiAgentSystem:
         api_url: str,
         auth_token: str,
         google_api_key: str,
+        profile_cache_ttl: float = PROFILE_CACHE_TTL,
     ):
         self.api_url = api_url
         self.auth_token = auth_token
         self.gemini = genai.Client(api_key=google_api_key)
 
-        # Initialize agents
-        self.agents: dict[str, tuple[AgentConfig, A2PClient, CloudStorage]] = {}
+        # One connection pool shared by every agent's storage; each storage
+        # still sends its own agent DID
+        self._http = httpx.AsyncClient(limits=DEFAULT_LIMITS, timeout=30.0)
+
+        # Agent configs by role; each agent's client and storage are created
+        # on first use by _get_agent, so unused roles cost nothing
+        self.configs: dict[str, AgentConfig] = {agent.role: agent for agent in AGENTS}
+        self._agent_cache: dict[str, tuple[AgentConfig, A2PClient, CloudStorage]] = {}
+
+        self.current_user_did: Optional[str] = None
+        self.user_context: str = ""
 
-        for agent_config in AGENTS:
+        # Per user: when the context was built (time.monotonic()) and the context
+        self.profile_cache_ttl = profile_cache_ttl
+        self._profile_cache: dict[str, tuple[float, str]] = {}
+
+        # Per user: profile ETag and the context built from it, reused when a
+        # refetch finds the profile unchanged
+        self._built_contexts: dict[str, tuple[str, str]] = {}
+
+        # Per role: generation config for the current user context, pointing
+        # at the Gemini cache that holds the agent's system prompt and the
+        # context, or carrying them inline if they are too short to cache;
+        # paired with the time.monotonic() after which it must be rebuilt
+        self._chat_configs: dict[str, tuple[types.GenerateContentConfig, float]] = {}
+
+    def _get_agent(self, role: str) -> tuple[AgentConfig, A2PClient, CloudStorage]:
+        """Get the config, client and storage of an agent, creating them on first use"""
+        agent = self._agent_cache.get(role)
+        if agent is None:
+            agent_config = self.configs[role]
             storage = CloudStorage(
-                api_url=api_url,
-                auth_token=auth_token,
+                api_url=self.api_url,
+                auth_token=self.auth_token,
                 agent_did=agent_config.did,
+                client=self._http,
             )
             client = A2PClient(
                 agent_did=agent_config.did,
                 storage=storage,
             )
-            self.agents[agent_config.role] = (agent_config, client, storage)
-
-        self.current_user_did: Optional[str] = None
-        self.user_context: str = ""
+            agent = self._agent_cache[role] = (agent_config, client, storage)
+        return agent
 
     async def load_user_context(self, user_did: str) -> str:
         """Load user profile (shared by all agents)"""
         self.current_user_did = user_did
 
+        cached = self._profile_cache.get(user_did)
+        if cached is not None and time.monotonic() - cached[0] < self.profile_cache_ttl:
+            await self._set_user_context(cached[1])
+            return self.user_context
+
         # Use the assistant agent to load profile
-        _, client, _ = self.agents["assistant"]
+        _, client, storage = self._get_agent("assistant")
         profile = await client.get_profile(user_did)
 
         if not profile:
-            self.user_context = "New user, no profile data available."
+            await self._set_user_context("New user, no profile data available.")
+            self._profile_cache[user_did] = (time.monotonic(), self.user_context)
             return self.user_context
 
+        # CloudStorage revalidates with If-None-Match; an unchanged ETag
+        # means the context built last time still holds
+        etag = storage.get_etag(user_did)
+        built = self._built_contexts.get(user_did)
+        if etag is not None and built is not None and built[0] == etag:
+            context = built[1]
+        else:
+            context = self._build_context(profile)
+            if etag is not None:
+                self._built_contexts[user_did] = (etag, context)
+
+        await self._set_user_context(context)
+        self._profile_cache[user_did] = (time.monotonic(), self.user_context)
+        return self.user_context
+
+    @staticmethod
+    def _build_context(profile: Profile) -> str:
+        """Describe a profile for the agents' prompts"""
         context_parts = []
 
         if profile.identity and profile.identity.display_name:
@@ -126,84 +207,182 @@ class MultiAgentSystem:
                 context_parts.append(f"Timezone: {prefs.timezone}")
 
         if profile.memories:
-            memories_list = []
-            for category in ["semantic", "episodic", "procedural"]:
-                memories = getattr(profile.memories, category, [])
-                if memories:
-                    for mem in memories[:3]:
-                        memories_list.append(f"- {mem.content}")
+            # Up to 3 per category, joined in one pass
+            mems = profile.memories
+            memories = "\n".join(
+                "- " + mem.content
+                for category in (mems.semantic, mems.episodic, mems.procedural)
+                for mem in (category or ())[:3]
+            )
 
-            if memories_list:
-                context_parts.append("Known:\n" + "\n".join(memories_list))
+            if memories:
+                context_parts.append("Known:\n" + memories)
 
-        self.user_context = "\n".join(context_parts) if context_parts else "No profile data."
-        return self.user_context
+        return "\n".join(context_parts) if context_parts else "No profile data."
+
+    async def _set_user_context(self, context: str) -> None:
+        """Store the user context; cached prompts built from another context are dropped"""
+        if context != self.user_context:
+            await self._drop_prompt_caches()
+        self.user_context = context
 
-    async def route_message(self, message: str) -> tuple[str, str]:
+    def _system_instruction(self, agent_config: AgentConfig) -> str:
+        return f"""{agent_config.system_prompt}
+
+User Profile:
+{self.user_context}"""
+
+    async def _chat_config(self, agent_config: AgentConfig) -> types.GenerateContentConfig:
+        """Generation config for an agent, caching its prompt with Gemini when it is long enough"""
+        entry = self._chat_configs.get(agent_config.role)
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+
+        instruction = self._system_instruction(agent_config)
+        config = types.GenerateContentConfig(
+            system_instruction=instruction,
+            temperature=0.7,
+            max_output_tokens=1024,
+        )
+        expires_at = float("inf")
+
+        # About 4 characters per token; shorter prompts are sent with every
+        # request rather than spending a round trip on a cache Gemini rejects
+        if len(instruction) // 4 >= MIN_CACHE_TOKENS:
+            deadline = time.monotonic() + PROMPT_CACHE_TTL - PROMPT_CACHE_MARGIN
+            try:
+                cache = await self.gemini.aio.caches.create(
+                    model=MODEL,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=instruction,
+                        ttl=f"{PROMPT_CACHE_TTL}s",
+                    ),
+                )
+            except errors.ClientError as e:
+                # 400: the estimate was off and the prompt is still too
+                # short; keep it inline. Anything else (auth, quota) is raised.
+                if e.code != 400:
+                    raise
+            else:
+                config = types.GenerateContentConfig(
+                    cached_content=cache.name,
+                    temperature=0.7,
+                    max_output_tokens=1024,
+                )
+                expires_at = deadline
+
+        self._chat_configs[agent_config.role] = (config, expires_at)
+        return config
+
+    async def _drop_prompt_caches(self) -> None:
+        names = [c.cached_content for c, _ in self._chat_configs.values() if c.cached_content]
+        self._chat_configs.clear()
+        await asyncio.gather(
+            *(self.gemini.aio.caches.delete(name=name) for name in names),
+            return_exceptions=True,
+        )
+
+    def pick_role(self, message: str) -> str:
+        """Choose the agent role for a message based on its keywords"""
+        match = _ROUTE_RE.search(message)
+        return match.lastgroup if match else "assistant"
+
+    async def route_message(
+        self,
+        message: str,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> tuple[str, str]:
         """
         Route a message to the appropriate agent based on content.
         Returns (agent_role, response).
         """
-        # Simple routing based on keywords
-        message_lower = message.lower()
+        role = self.pick_role(message)
+        return role, await self.chat(role, message, on_text)
 
-        if any(word in message_lower for word in ["schedule", "meeting", "calendar", "time", "appointment"]):
-            role = "scheduler"
-        elif any(word in message_lower for word in ["research", "find", "search", "learn about", "explain"]):
-            role = "research"
-        else:
-            role = "assistant"
-
-        return role, await self.chat(role, message)
+    async def chat(
+        self,
+        role: str,
+        message: str,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Send a message to a specific agent.
 
-    async def chat(self, role: str, message: str) -> str:
-        """Send a message to a specific agent"""
-        if role not in self.agents:
+        The response is streamed; if given, on_text receives each piece as it
+        arrives. Returns the full response.
+        """
+        # Chatting only needs the agent's prompt, not its Gaugid client
+        agent_config = self.configs.get(role)
+        if agent_config is None:
             return f"Unknown agent role: {role}"
 
-        agent_config, client, _ = self.agents[role]
-
-        prompt = f"""{agent_config.system_prompt}
-
-User Profile:
-{self.user_context}
-
-User message: {message}
+        prompt = f"""User message: {message}
 
 Respond helpfully and naturally."""
 
-        response = self.gemini.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                temperature=0.7,
-                max_output_tokens=1024,
-            ),
-        )
+        # The agent's system prompt and the user context only change with the
+        # profile, so Gemini keeps them cached and each turn sends just the
+        # message; the config itself is built once per agent and context
+        config = await self._chat_config(agent_config)
+
+        # The async client keeps the event loop free during the request
+        try:
+            stream = await self.gemini.aio.models.generate_content_stream(
+                model=MODEL,
+                contents=prompt,
+                config=config,
+            )
+        except errors.ClientError as e:
+            # A cache removed on Gemini's side before its expected expiry
+            # is reported as not found (403/404); rebuild it and retry once
+            if not config.cached_content or e.code not in (403, 404):
+                raise
+            del self._chat_configs[role]
+            stream = await self.gemini.aio.models.generate_content_stream(
+                model=MODEL,
+                contents=prompt,
+                config=await self._chat_config(agent_config),
+            )
 
-        return response.text
+        parts = []
+        async for chunk in stream:
+            if chunk.text:
+                parts.append(chunk.text)
+                if on_text:
+                    on_text(chunk.text)
+        return "".join(parts)
 
     async def propose_memory(self, role: str, content: str, category: str = "a2p:episodic"):
         """Have an agent propose a memory"""
         if not self.current_user_did:
             return {"error": "No user loaded"}
 
-        if role not in self.agents:
+        if role not in self.configs:
             return {"error": f"Unknown agent role: {role}"}
 
-        _, client, _ = self.agents[role]
+        _, client, _ = self._get_agent(role)
 
-        return await client.propose_memory(
+        result = await client.propose_memory(
             user_did=self.current_user_did,
             content=content,
             category=category,
             confidence=0.8,
         )
+        # The profile may change once the proposal is reviewed
+        self._profile_cache.pop(self.current_user_did, None)
+        return result
 
     async def close(self):
         """Cleanup all agents"""
-        for _, _, storage in self.agents.values():
+        await self._drop_prompt_caches()
+        for _, _, storage in self._agent_cache.values():
             await storage.close()
+        await self._http.aclose()
+
+
+def _echo(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
 
 
 async def main():
@@ -261,7 +440,8 @@ async def main():
 
         while True:
             try:
-                user_input = input("You: ").strip()
+                # Read in a worker thread so the event loop keeps running
+                user_input = (await asyncio.to_thread(input, "You: ")).strip()
 
                 if not user_input:
                     continue
@@ -269,10 +449,12 @@ async def main():
                 if user_input.lower() in ("quit", "exit", "q"):
                     break
 
-                role, response = await system.route_message(user_input)
-                agent_name = next(a.name for a in AGENTS if a.role == role)
+                role = system.pick_role(user_input)
+                agent_name = system.configs[role].name
 
-                print(f"\n[{agent_name}]: {response}\n")
+                print(f"\n[{agent_name}]: ", end="", flush=True)
+                await system.chat(role, user_input, on_text=_echo)
+                print("\n")
 
             except EOFError:
                 break
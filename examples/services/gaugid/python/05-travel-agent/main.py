@@ -21,26 +21,38 @@ Usage:
     python main.py --conversation "I'm planning a trip to Japan in spring"
 """
 
+from __future__ import annotations
+
 import os
+import re
 import sys
 import json
+import time
 import asyncio
 import argparse
-from typing import Optional
-import requests
+import importlib
+from typing import TYPE_CHECKING, Callable, Optional
 from dataclasses import dataclass
 
+import httpx
+
 # Add local SDK to path (use local package instead of published)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../../packages/sdk/python/src"))
 
-# Google Vertex AI
-from google import genai
-from google.genai import types
+# Google Vertex AI; imported on first use (see run()), since loading the SDK
+# pulls in grpc and protobuf and takes a noticeable part of startup
+if TYPE_CHECKING:
+    from google.genai import types
 
 # Gaugid / a2p (from local SDK)
 from a2p import A2PClient, create_profile, add_memory
 from a2p.storage.cloud import CloudStorage
-from a2p.types import SensitivityLevel
+from a2p.types import Profile, SensitivityLevel
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser (also takes bytes)
+    _json_loads = json.loads
 
 
 # =============================================================================
@@ -72,6 +84,25 @@ class Config:
 
 config = Config()
 
+# JSON wrapped in a markdown code block, with or without a "json" tag
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+# Seconds a loaded user context is reused before the profile is fetched again
+PROFILE_CACHE_TTL = 300.0
+
+# Demo conversations sent to Gemini at the same time
+DEMO_CONCURRENCY = 4
+
+# Longest wait for background memory proposals before exiting
+PROPOSAL_WAIT_TIMEOUT = 5.0
+
+# One pooled client for the Firebase Emulator and Gaugid REST calls, so each
+# call reuses an open connection instead of connecting again
+http = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    timeout=10.0,
+)
+
 
 # =============================================================================
 # Firebase Authentication (Emulator)
@@ -90,7 +121,7 @@ def setup_firebase_admin():
     return auth
 
 
-def get_agent_token() -> str:
+async def get_agent_token() -> str:
     """
     Get Firebase ID token for the agent.
 
@@ -99,7 +130,9 @@ def get_agent_token() -> str:
     Returns:
         Firebase ID token for the agent
     """
-    auth = setup_firebase_admin()
+    # The Firebase Admin SDK is synchronous; run its calls in a worker thread
+    # so the event loop isn't blocked while they wait on the emulator
+    auth = await asyncio.to_thread(setup_firebase_admin)
 
     print(f"🔐 Setting up agent: {config.agent_did}...")
 
@@ -108,10 +141,11 @@ def get_agent_token() -> str:
 
     # Create or get agent user with DID as UID
     try:
-        user = auth.get_user(config.agent_did)
+        user = await asyncio.to_thread(auth.get_user, config.agent_did)
         print(f"   Agent exists: {user.uid}")
     except auth.UserNotFoundError:
-        user = auth.create_user(
+        user = await asyncio.to_thread(
+            auth.create_user,
             uid=config.agent_did,  # Use agent DID as Firebase UID
             email=agent_email,
             email_verified=True,
@@ -120,7 +154,7 @@ def get_agent_token() -> str:
         print(f"   Created agent user: {user.uid}")
 
     # Get ID token via REST API
-    response = requests.post(
+    response = await http.post(
         f"http://{config.firebase_emulator_host}/identitytoolkit.googleapis.com/v1/accounts:signInWithPassword",
         json={
             "email": agent_email,
@@ -131,7 +165,7 @@ def get_agent_token() -> str:
     )
 
     if response.status_code == 200:
-        token = response.json()["idToken"]
+        token = _json_loads(response.content)["idToken"]
         print(f"✅ Agent authenticated: {config.agent_did}")
         return token
     else:
@@ -145,62 +179,58 @@ async def register_agent(auth_token: str) -> bool:
     This calls POST /api/agents/register to register the agent.
     In local development, agents are auto-verified.
     """
-    import httpx
-
     print(f"   Registering agent via API...")
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{config.api_url}/api/agents/register",
-                headers={
-                    "Authorization": f"Bearer {auth_token}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "did": config.agent_did,
-                    "name": config.agent_name,
-                    "description": "AI travel advisor that helps plan trips and proposes travel-related memories",
-                    "ownerEmail": "travel-advisor@agent.local",
-                },
-                timeout=10.0,
-            )
+    try:
+        response = await http.post(
+            f"{config.api_url}/api/agents/register",
+            headers={
+                "Authorization": f"Bearer {auth_token}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "did": config.agent_did,
+                "name": config.agent_name,
+                "description": "AI travel advisor that helps plan trips and proposes travel-related memories",
+                "ownerEmail": "travel-advisor@agent.local",
+            },
+        )
 
-            if response.status_code == 201:
-                # New agent created
-                data = response.json()
-                agent = data.get("agent", {})
-                verified = agent.get("verified", False)
-                message = data.get("message", "")
-                print(f"   ✅ Agent registered" + (" and verified" if verified else " (verification pending)"))
-                if message:
-                    print(f"      {message}")
-                return True
-            elif response.status_code == 200:
-                # Agent already exists, was updated
-                data = response.json()
-                agent = data.get("agent", {})
-                verified = agent.get("verified", False)
-                message = data.get("message", "Agent already registered")
-                print(f"   ✅ {message}")
-                if verified:
-                    print(f"      Agent is verified")
-                return True
-            else:
-                error = response.json().get("error", {})
-                print(f"   ⚠️ Registration failed: {error.get('message', response.text)}")
-                return False
-
-        except httpx.RequestError as e:
-            print(f"   ⚠️ Could not connect to API: {e}")
-            print(f"   Make sure Gaugid API is running at {config.api_url}")
-            return False
-        except Exception as e:
-            print(f"   ⚠️ Registration error: {e}")
+        if response.status_code == 201:
+            # New agent created
+            data = _json_loads(response.content)
+            agent = data.get("agent", {})
+            verified = agent.get("verified", False)
+            message = data.get("message", "")
+            print(f"   ✅ Agent registered" + (" and verified" if verified else " (verification pending)"))
+            if message:
+                print(f"      {message}")
+            return True
+        elif response.status_code == 200:
+            # Agent already exists, was updated
+            data = _json_loads(response.content)
+            agent = data.get("agent", {})
+            verified = agent.get("verified", False)
+            message = data.get("message", "Agent already registered")
+            print(f"   ✅ {message}")
+            if verified:
+                print(f"      Agent is verified")
+            return True
+        else:
+            error = _json_loads(response.content).get("error", {})
+            print(f"   ⚠️ Registration failed: {error.get('message', response.text)}")
             return False
 
+    except httpx.RequestError as e:
+        print(f"   ⚠️ Could not connect to API: {e}")
+        print(f"   Make sure Gaugid API is running at {config.api_url}")
+        return False
+    except Exception as e:
+        print(f"   ⚠️ Registration error: {e}")
+        return False
+
 
-def get_user_firebase_token(email: str, password: str) -> tuple[str, str]:
+async def get_user_firebase_token(email: str, password: str) -> tuple[str, str]:
     """
     Authenticate user and get Firebase token and UID.
 
@@ -210,7 +240,7 @@ def get_user_firebase_token(email: str, password: str) -> tuple[str, str]:
     print(f"🔐 Authenticating user {email}...")
 
     # Sign in to get/verify user
-    response = requests.post(
+    response = await http.post(
         f"http://{config.firebase_emulator_host}/identitytoolkit.googleapis.com/v1/accounts:signInWithPassword",
         json={
             "email": email,
@@ -221,12 +251,12 @@ def get_user_firebase_token(email: str, password: str) -> tuple[str, str]:
     )
 
     if response.status_code == 200:
-        data = response.json()
+        data = _json_loads(response.content)
         print(f"✅ User authenticated: {data['localId']}")
         return data["idToken"], data["localId"]
     elif response.status_code == 400 and "EMAIL_NOT_FOUND" in response.text:
         # Create user
-        response = requests.post(
+        response = await http.post(
             f"http://{config.firebase_emulator_host}/identitytoolkit.googleapis.com/v1/accounts:signUp",
             json={
                 "email": email,
@@ -236,7 +266,7 @@ def get_user_firebase_token(email: str, password: str) -> tuple[str, str]:
             params={"key": "fake-api-key"}
         )
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             print(f"✅ User created: {data['localId']}")
             return data["idToken"], data["localId"]
 
@@ -249,24 +279,20 @@ async def get_user_profiles(user_token: str) -> list[dict]:
 
     This uses the user-facing API endpoint, not the protocol endpoint.
     """
-    import httpx
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{config.api_url}/api/profiles",
-            headers={
-                "Authorization": f"Bearer {user_token}",
-                "Content-Type": "application/json",
-            },
-            timeout=10.0,
-        )
+    response = await http.get(
+        f"{config.api_url}/api/profiles",
+        headers={
+            "Authorization": f"Bearer {user_token}",
+            "Content-Type": "application/json",
+        },
+    )
 
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("profiles", [])
-        else:
-            print(f"⚠️ Failed to get profiles: {response.text}")
-            return []
+    if response.status_code == 200:
+        data = _json_loads(response.content)
+        return data.get("profiles", [])
+    else:
+        print(f"⚠️ Failed to get profiles: {response.text}")
+        return []
 
 
 def select_profile_did(profiles: list[dict], profile_did: str | None = None) -> str | None:
@@ -368,13 +394,55 @@ async def setup_travel_profile(client: A2PClient, user_did: str) -> None:
 # Travel Agent (Vertex AI)
 # =============================================================================
 
+# Prompt scaffold; only the user context changes between sessions
+_SYSTEM_PROMPT = """You are a helpful travel advisor assistant. You have access to the user's travel preferences and should use them to personalize your recommendations.
+
+User Profile:
+{context}
+
+Guidelines:
+1. Use known preferences to personalize recommendations
+2. Consider dietary restrictions, language abilities, accommodation preferences
+3. Suggest specific destinations, activities, or tips
+4. Be helpful and enthusiastic about travel
+5. If the user mentions new preferences, note them for memory
+
+Respond naturally and helpfully to the user's travel-related question or request.""".format
+
+# Generation settings; each agent turns them into configs once
+_CHAT_SETTINGS = {"temperature": 0.7, "max_output_tokens": 1024}
+_ANALYSIS_SETTINGS = {"temperature": 0.2}  # Lower for consistent JSON
+
+
 class TravelAgent:
     """AI Travel Agent powered by Vertex AI with Gaugid profile integration"""
 
-    def __init__(self, a2p_client: A2PClient, user_did: str):
+    def __init__(
+        self,
+        a2p_client: A2PClient,
+        user_did: str,
+        profile_cache_ttl: float = PROFILE_CACHE_TTL,
+    ):
+        from google import genai
+        from google.genai import types
+
         self.a2p_client = a2p_client
         self.user_did = user_did
         self.user_context = ""
+        # System prompt message built from user_context by _set_user_context
+        self._system_content: Optional[types.Content] = None
+        self._set_user_context("")
+
+        # Per user: when the context was built (time.monotonic()) and the context
+        self.profile_cache_ttl = profile_cache_ttl
+        self._profile_cache: dict[str, tuple[float, str]] = {}
+
+        # Per user: profile ETag and the context built from it, reused when a
+        # refetch finds the profile unchanged
+        self._built_contexts: dict[str, tuple[str, str]] = {}
+
+        # Background memory analyses still running; see wait_for_proposals
+        self._pending_analyses: set[asyncio.Task] = set()
 
         # Initialize Vertex AI client
         print(f"\n🤖 Initializing Vertex AI ({config.gcp_project} / {config.gcp_location})...")
@@ -385,19 +453,59 @@ class TravelAgent:
         )
         print("✅ Vertex AI initialized")
 
+        self._chat_config = types.GenerateContentConfig(**_CHAT_SETTINGS)
+        self._analysis_config = types.GenerateContentConfig(**_ANALYSIS_SETTINGS)
+
     async def load_user_context(self) -> str:
         """Load user profile and build context for AI"""
+        cached = self._profile_cache.get(self.user_did)
+        if cached is not None and time.monotonic() - cached[0] < self.profile_cache_ttl:
+            self._set_user_context(cached[1])
+            return self.user_context
+
         print("\n📖 Loading user profile from Gaugid...")
 
         # Request profile with scopes needed for travel recommendations
         # Note: In production, this would require user consent via consent policies
         scopes = ["a2p:identity", "a2p:preferences", "a2p:episodic"]
-        profile = await self.a2p_client.storage.get(self.user_did, scopes=scopes)
+        storage = self.a2p_client.storage
+        profile = await storage.get(self.user_did, scopes=scopes)
 
         if not profile:
-            self.user_context = "New traveler, no preferences known yet."
+            self._set_user_context("New traveler, no preferences known yet.")
+            self._profile_cache[self.user_did] = (time.monotonic(), self.user_context)
             return self.user_context
 
+        # CloudStorage revalidates with If-None-Match; an unchanged ETag
+        # means the context built last time still holds
+        etag = storage.get_etag(self.user_did, scopes)
+        built = self._built_contexts.get(self.user_did)
+        if etag is not None and built is not None and built[0] == etag:
+            self._set_user_context(built[1])
+        else:
+            self._set_user_context(self._build_context(profile))
+            if etag is not None:
+                self._built_contexts[self.user_did] = (etag, self.user_context)
+        self._profile_cache[self.user_did] = (time.monotonic(), self.user_context)
+
+        print(f"✅ Profile loaded")
+        print(f"   Context: {len(self.user_context)} chars")
+
+        return self.user_context
+
+    def _set_user_context(self, context: str) -> None:
+        """Store the user context and the system prompt message built from it"""
+        from google.genai import types
+
+        if context != self.user_context or self._system_content is None:
+            self._system_content = types.Content(
+                role="user", parts=[types.Part(text=_SYSTEM_PROMPT(context=context))]
+            )
+        self.user_context = context
+
+    @staticmethod
+    def _build_context(profile: Profile) -> str:
+        """Describe a profile for the travel prompts"""
         context_parts = []
 
         # Identity
@@ -406,64 +514,72 @@ class TravelAgent:
 
         # Collect memories
         if profile.memories:
-            memories_list = []
-            for category in ["semantic", "episodic", "procedural"]:
-                memories = getattr(profile.memories, category, [])
-                if memories:
-                    for mem in memories:
-                        memories_list.append(f"- {mem.content}")
-
-            if memories_list:
-                context_parts.append("Known preferences:\n" + "\n".join(memories_list))
-
-        self.user_context = "\n".join(context_parts) if context_parts else "No profile data."
+            mems = profile.memories
+            memories = "\n".join(
+                "- " + mem.content
+                for category in (mems.semantic, mems.episodic, mems.procedural)
+                for mem in category or ()
+            )
 
-        print(f"✅ Profile loaded")
-        print(f"   Context: {len(self.user_context)} chars")
+            if memories:
+                context_parts.append("Known preferences:\n" + memories)
 
-        return self.user_context
+        return "\n".join(context_parts) if context_parts else "No profile data."
 
-    async def chat(self, user_message: str) -> str:
+    async def chat(
+        self,
+        user_message: str,
+        on_text: Optional[Callable[[str], None]] = None,
+        on_report: Optional[Callable[[str], None]] = None,
+    ) -> str:
         """
         Process a travel-related message and generate personalized response.
-        """
-        system_prompt = f"""You are a helpful travel advisor assistant. You have access to the user's travel preferences and should use them to personalize your recommendations.
 
-User Profile:
-{self.user_context}
-
-Guidelines:
-1. Use known preferences to personalize recommendations
-2. Consider dietary restrictions, language abilities, accommodation preferences
-3. Suggest specific destinations, activities, or tips
-4. Be helpful and enthusiastic about travel
-5. If the user mentions new preferences, note them for memory
-
-Respond naturally and helpfully to the user's travel-related question or request."""
+        The response is streamed; if given, on_text receives each piece as it
+        arrives. Returns the full response. The memory analysis started for
+        the turn reports its proposals through on_report (print by default).
+        """
+        from google.genai import types
 
-        # Generate response
-        response = self.genai_client.models.generate_content(
+        # Generate response; the async client keeps the event loop free
+        # (e.g. for the previous turn's memory proposals) during the request
+        stream = await self.genai_client.aio.models.generate_content_stream(
             model=config.model,
             contents=[
-                types.Content(role="user", parts=[types.Part(text=system_prompt)]),
+                self._system_content,
                 types.Content(role="user", parts=[types.Part(text=user_message)]),
             ],
-            config=types.GenerateContentConfig(
-                temperature=0.7,
-                max_output_tokens=1024,
-            ),
+            config=self._chat_config,
         )
 
-        assistant_response = response.text
+        parts = []
+        async for chunk in stream:
+            if chunk.text:
+                parts.append(chunk.text)
+                if on_text:
+                    on_text(chunk.text)
+        assistant_response = "".join(parts)
 
         # Analyze for new memories (async)
-        asyncio.create_task(
-            self._analyze_and_propose(user_message, assistant_response)
+        task = asyncio.create_task(
+            self._analyze_and_propose(user_message, assistant_response, on_report or print)
         )
+        self._pending_analyses.add(task)
+        task.add_done_callback(self._pending_analyses.discard)
 
         return assistant_response
 
-    async def _analyze_and_propose(self, user_message: str, assistant_response: str) -> None:
+    async def wait_for_proposals(self, timeout: Optional[float] = PROPOSAL_WAIT_TIMEOUT) -> None:
+        """Wait until the memory analyses started by chat() have finished, or timeout"""
+        if self._pending_analyses:
+            await asyncio.wait(self._pending_analyses, timeout=timeout)
+
+    async def _analyze_and_propose(
+        self,
+        user_message: str,
+        assistant_response: str,
+        report: Callable[[str], None] = print,
+    ) -> None:
         """Analyze conversation and propose travel-related memories"""
 
         analysis_prompt = f"""Analyze this travel conversation for new information worth remembering about the traveler.
@@ -496,53 +612,79 @@ If nothing new was revealed, respond with an empty array: []
 Respond ONLY with valid JSON, no markdown or explanation."""
 
         try:
-            response = self.genai_client.models.generate_content(
+            response = await self.genai_client.aio.models.generate_content(
                 model=config.model,
                 contents=analysis_prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.2,  # Lower for consistent JSON
-                ),
+                config=self._analysis_config,
             )
 
-            response_text = response.text.strip()
-
             # Handle markdown code blocks
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
+            fenced = _JSON_FENCE_RE.search(response.text)
+            response_text = fenced.group(1) if fenced else response.text.strip()
 
-            proposals = json.loads(response_text)
+            proposals = _json_loads(response_text)
 
             if not proposals:
                 return
 
-            # Propose each memory
-            for proposal in proposals:
-                try:
-                    result = await self.a2p_client.propose_memory(
-                        user_did=self.user_did,
-                        content=proposal["content"],
-                        category=proposal.get("category", "a2p:preferences"),
-                        confidence=proposal.get("confidence", 0.8),
-                        context=f"Travel conversation: {user_message[:100]}",
-                    )
-                    print(f"\n  📝 Proposed: {proposal['content'][:60]}...")
-                    print(f"     Status: {result.get('status', 'pending')}")
-                except Exception as e:
-                    print(f"\n  ⚠️ Failed to propose: {e}")
+            # Propose all memories in one batch
+            context = f"Travel conversation: {user_message[:100]}"
+            try:
+                results = await self.a2p_client.propose_memories(
+                    self.user_did,
+                    [
+                        {
+                            "content": proposal["content"],
+                            "category": proposal.get("category", "a2p:preferences"),
+                            "confidence": proposal.get("confidence", 0.8),
+                            "context": context,
+                        }
+                        for proposal in proposals
+                    ],
+                )
+            except Exception as e:
+                report(f"\n  ⚠️ Failed to propose: {e}")
+                return
+
+            # Each proposal succeeds or fails on its own; a rejected one is
+            # returned as its exception
+            for proposal, result in zip(proposals, results):
+                if isinstance(result, BaseException):
+                    report(f"\n  ⚠️ Failed to propose: {result}")
+                    continue
+                # The profile may change once the proposal is reviewed
+                self._profile_cache.pop(self.user_did, None)
+                report(f"\n  📝 Proposed: {proposal['content'][:60]}...")
+                report(f"     Status: {result.get('status', 'pending')}")
 
         except json.JSONDecodeError:
             pass  # No valid memories
         except Exception as e:
-            print(f"\n  ⚠️ Analysis error: {e}")
+            report(f"\n  ⚠️ Analysis error: {e}")
 
 
 # =============================================================================
 # Main
 # =============================================================================
 
+def _echo(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def print_block(*lines: str) -> None:
+    """Print a fixed block of lines (banners, headers) with a single write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 async def main():
+    try:
+        await run()
+    finally:
+        await http.aclose()
+
+
+async def run():
     parser = argparse.ArgumentParser(description="Gaugid Travel Agent Example")
     parser.add_argument(
         "--conversation",
@@ -559,29 +701,48 @@ async def main():
     )
     args = parser.parse_args()
 
-    print("=" * 60)
-    print("  🌴 Gaugid Travel Agent Example")
-    print("=" * 60)
-    print(f"\n📡 Gaugid API: {config.api_url}")
-    print(f"🔥 Firebase Emulator: {config.firebase_emulator_host}")
-    print(f"☁️  Vertex AI: {config.gcp_project} / {config.gcp_location}")
+    # Load the Gemini SDK in a worker thread while the steps below wait on
+    # Firebase and Gaugid; the agent needs it only after those
+    genai_import = asyncio.create_task(asyncio.to_thread(importlib.import_module, "google.genai"))
+
+    print_block(
+        "=" * 60,
+        "  🌴 Gaugid Travel Agent Example",
+        "=" * 60,
+        f"\n📡 Gaugid API: {config.api_url}",
+        f"🔥 Firebase Emulator: {config.firebase_emulator_host}",
+        f"☁️  Vertex AI: {config.gcp_project} / {config.gcp_location}",
+    )
 
-    # Step 1: Authenticate user and get their profiles
-    try:
-        user_token, firebase_uid = get_user_firebase_token(
+    # Step 1: Authenticate the user and get their profiles
+    async def load_user() -> list[dict]:
+        user_token, firebase_uid = await get_user_firebase_token(
             config.user_email,
             config.user_password
         )
-    except Exception as e:
-        print(f"\n❌ Failed to authenticate user: {e}")
+        print(f"\n👤 User Firebase UID: {firebase_uid}")
+        print("\n📋 Getting user's profiles...")
+        return await get_user_profiles(user_token)
+
+    # Step 2: Get the agent token and register the agent with the Gaugid API
+    # (required before accessing profiles)
+    async def load_agent() -> tuple[str, bool]:
+        auth_token = await get_agent_token()
+        print("\n🔧 Registering agent with Gaugid...")
+        return auth_token, await register_agent(auth_token)
+
+    # The two chains share nothing, so they wait on Firebase and Gaugid
+    # together; failures are reported below in the original step order
+    user_result, agent_result = await asyncio.gather(
+        load_user(), load_agent(), return_exceptions=True
+    )
+
+    if isinstance(user_result, BaseException):
+        print(f"\n❌ Failed to authenticate user: {user_result}")
         print("\nMake sure Firebase Emulator is running at localhost:9099")
         return
 
-    print(f"\n👤 User Firebase UID: {firebase_uid}")
-
-    # Step 1b: Get user's profiles
-    print("\n📋 Getting user's profiles...")
-    profiles = await get_user_profiles(user_token)
+    profiles = user_result
 
     if not profiles:
         print("⚠️  No profiles found for this user.")
@@ -590,10 +751,12 @@ async def main():
         return
 
     print(f"   Found {len(profiles)} profile(s):")
+    by_did = {}
     for i, profile in enumerate(profiles, 1):
         profile_type = profile.get("profileType", "unknown")
         display_name = profile.get("identity", {}).get("displayName") or "Unnamed"
         did = profile.get("did", "unknown")
+        by_did.setdefault(did, profile)
         print(f"   {i}. {display_name} ({profile_type}) - {did}")
 
     # Select profile
@@ -606,23 +769,18 @@ async def main():
         return
 
     user_did = selected_did
-    selected_profile = next(p for p in profiles if p["did"] == selected_did)
+    selected_profile = by_did[selected_did]
     print(f"\n✅ Using profile: {selected_profile.get('identity', {}).get('displayName', 'Unnamed')}")
     print(f"   DID: {user_did}")
 
-    # Step 2: Get agent token (agent identity for API calls)
-    try:
-        auth_token = get_agent_token()
-    except Exception as e:
-        print(f"\n❌ Agent authentication failed: {e}")
+    if isinstance(agent_result, BaseException):
+        print(f"\n❌ Agent authentication failed: {agent_result}")
         print("\nMake sure:")
         print("  1. Gaugid is running: cd ../a2p-cloud && docker-compose up -d")
         print("  2. Firebase Emulator is accessible at localhost:9099")
         return
 
-    # Step 2b: Register agent with Gaugid API (required before accessing profiles)
-    print("\n🔧 Registering agent with Gaugid...")
-    registration_success = await register_agent(auth_token)
+    auth_token, registration_success = agent_result
 
     if not registration_success:
         print("\n⚠️  Agent registration failed. The agent may not be able to access profiles.")
@@ -651,6 +809,7 @@ async def main():
         await setup_travel_profile(client, user_did)
 
         # Step 5: Initialize Travel Agent
+        await genai_import
         agent = TravelAgent(client, user_did)
         await agent.load_user_context()
 
@@ -661,11 +820,12 @@ async def main():
             print(f"👤 User: {args.conversation}")
             print("=" * 60)
 
-            response = await agent.chat(args.conversation)
-            print(f"\n🤖 Travel Advisor:\n{response}")
+            print("\n🤖 Travel Advisor:")
+            await agent.chat(args.conversation, on_text=_echo)
+            print()
 
             # Wait for async proposals
-            await asyncio.sleep(2)
+            await agent.wait_for_proposals()
 
         elif args.interactive:
             # Interactive mode
@@ -676,7 +836,8 @@ async def main():
 
             while True:
                 try:
-                    user_input = input("You: ").strip()
+                    # Read in a worker thread so background proposals keep running
+                    user_input = (await asyncio.to_thread(input, "You: ")).strip()
 
                     if not user_input:
                         continue
@@ -684,8 +845,9 @@ async def main():
                     if user_input.lower() in ("quit", "exit", "q"):
                         break
 
-                    response = await agent.chat(user_input)
-                    print(f"\n🤖 Travel Advisor:\n{response}\n")
+                    print("\n🤖 Travel Advisor:")
+                    await agent.chat(user_input, on_text=_echo)
+                    print("\n")
 
                 except EOFError:
                     break
@@ -696,9 +858,11 @@ async def main():
 
         else:
             # Demo mode with sample conversations
-            print("\n" + "=" * 60)
-            print("🎬 Demo Mode - Sample Travel Conversations")
-            print("=" * 60)
+            print_block(
+                "\n" + "=" * 60,
+                "🎬 Demo Mode - Sample Travel Conversations",
+                "=" * 60,
+            )
 
             demo_conversations = [
                 "I'm planning a trip to Japan in April. I've heard it's cherry blossom season!",
@@ -706,20 +870,37 @@ async def main():
                 "I have a budget of around $3000 for a 10-day trip. Is that reasonable for Japan?",
             ]
 
-            for i, conversation in enumerate(demo_conversations, 1):
-                print(f"\n--- Conversation {i} ---")
-                print(f"\n👤 User: {conversation}")
+            # Each demo turn is independent, so run them together with a cap
+            # on in-flight requests and print the replies in order afterwards.
+            # Each turn's proposal output is held back and printed under it.
+            sem = asyncio.Semaphore(DEMO_CONCURRENCY)
+            reports: list[list[str]] = [[] for _ in demo_conversations]
 
-                response = await agent.chat(conversation)
-                print(f"\n🤖 Travel Advisor:\n{response}")
+            async def _one(conversation: str, report: list[str]) -> str:
+                async with sem:
+                    return await agent.chat(conversation, on_report=report.append)
+
+            responses = await asyncio.gather(
+                *(_one(c, r) for c, r in zip(demo_conversations, reports))
+            )
 
-                # Wait for proposals
-                await asyncio.sleep(2)
+            # Wait for proposals
+            await agent.wait_for_proposals()
 
-            print("\n" + "=" * 60)
-            print("📋 Check Gaugid Dashboard for proposed memories:")
-            print("   http://localhost:3000/proposals")
-            print("=" * 60)
+            turns = zip(demo_conversations, responses, reports)
+            for i, (conversation, response, report) in enumerate(turns, 1):
+                print(f"\n--- Conversation {i} ---")
+                print(f"\n👤 User: {conversation}")
+                print(f"\n🤖 Travel Advisor:\n{response}")
+                for line in report:
+                    print(line)
+
+            print_block(
+                "\n" + "=" * 60,
+                "📋 Check Gaugid Dashboard for proposed memories:",
+                "   http://localhost:3000/proposals",
+                "=" * 60,
+            )
 
     finally:
         await storage.close()
@@ -15,7 +15,10 @@ Architecture:
                       └── Both agents respect user's a2p profile ──┘
 """
 
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -24,6 +27,12 @@ from a2p import (
 )
 
 
+@lru_cache(maxsize=128)
+def _compile_path(key: str) -> Tuple[str, ...]:
+    """Split a dot-notation key once; agents check the same few keys per message."""
+    return tuple(key.split("."))
+
+
 class A2AMessageType(str, Enum):
     """A2A Protocol message types."""
 
@@ -35,6 +44,22 @@ class A2AMessageType(str, Enum):
 
 
 @dataclass
+class CacheConfig:
+    """
+    Limits for the adapter's cache of loaded user contexts.
+
+    Attributes:
+        ttl_seconds: How long a loaded context is reused before the
+            profile is fetched again
+        max_entries: Most contexts kept; the least recently used one is
+            dropped first
+    """
+
+    ttl_seconds: float = 420.0
+    max_entries: int = 1000
+
+
+@dataclass(frozen=True, slots=True)
 class A2PContext:
     """
     a2p user context that can be shared via A2A.
@@ -43,6 +68,9 @@ class A2PContext:
     - Loaded from user's a2p profile
     - Attached to A2A messages
     - Respected by receiving agents
+
+    A context is immutable once built, so its A2A metadata is built once and
+    shared by every message it is attached to.
     """
 
     user_did: str
@@ -50,9 +78,22 @@ class A2PContext:
     constraints: Dict[str, Any]
     context_summary: str
     scopes_granted: List[str]
+    _metadata: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_a2a_metadata(self) -> Dict[str, Any]:
-        """Convert to A2A metadata format."""
+        """
+        Convert to A2A metadata format.
+
+        The same dict is returned on every call; treat it as read-only.
+        """
+        if self._metadata is None:
+            object.__setattr__(self, "_metadata", self._build_metadata())
+        return self._metadata
+
+    def _build_metadata(self) -> Dict[str, Any]:
+        """Build the A2A metadata dict."""
         return {
             "a2p_context": {
                 "version": "1.0",
@@ -80,7 +121,7 @@ class A2PContext:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class A2AMessage:
     """
     A2A Protocol message with a2p context.
@@ -97,25 +138,27 @@ class A2AMessage:
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize for A2A transport."""
-        result = {
+        # Attach a2p context to metadata
+        if self.a2p_context:
+            metadata = {**self.metadata, **self.a2p_context.to_a2a_metadata()}
+        else:
+            metadata = self.metadata.copy()
+
+        return {
             "type": self.type.value,
             "sender": self.sender_agent,
             "content": self.content,
-            "metadata": self.metadata.copy(),
+            "metadata": metadata,
         }
 
-        # Attach a2p context to metadata
-        if self.a2p_context:
-            if isinstance(result["metadata"], dict):
-                result["metadata"].update(self.a2p_context.to_a2a_metadata())
-
-        return result
-
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "A2AMessage":
         """Deserialize from A2A transport."""
-        metadata = data.get("metadata", {})
-        a2p_context = A2PContext.from_a2a_metadata(metadata)
+        metadata = data.get("metadata") or {}
+        # Most messages carry no a2p context; skip the lookup for those
+        a2p_context = None
+        if "a2p_context" in metadata:
+            a2p_context = A2PContext.from_a2a_metadata(metadata)
 
         return cls(
             type=A2AMessageType(data["type"]),
@@ -168,6 +211,7 @@ class A2PA2AAdapter:
         private_key: Optional[str] = None,
         default_scopes: Optional[List[str]] = None,
         storage: Optional[Any] = None,
+        cache_config: Optional[CacheConfig] = None,
     ):
         """
         Initialize the adapter.
@@ -178,6 +222,7 @@ class A2PA2AAdapter:
             private_key: Optional private key
             default_scopes: Default scopes to request
             storage: Optional storage backend
+            cache_config: Limits for cached user contexts
         """
         self.agent_did = agent_did
         self.agent_name = agent_name
@@ -187,7 +232,14 @@ class A2PA2AAdapter:
             "a2p:constraints",
             "a2p:context",
         ]
-        self._loaded_contexts: Dict[str, A2PContext] = {}
+        self.cache_config = cache_config or CacheConfig()
+        # (user_did, sorted scopes) -> (context, time.monotonic() when loaded),
+        # least recently used first
+        self._loaded_contexts: OrderedDict[
+            Tuple[str, Tuple[str, ...]], Tuple[A2PContext, float]
+        ] = OrderedDict()
+        # user_did -> key of that user's most recently used context
+        self._latest_keys: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
 
     async def load_user_context(
         self,
@@ -197,6 +249,10 @@ class A2PA2AAdapter:
         """
         Load user context from a2p profile for A2A sharing.
 
+        A context loaded for the same user and scopes within
+        ``cache_config.ttl_seconds`` is returned without fetching the
+        profile again.
+
         Args:
             user_did: The user's DID
             scopes: Scopes to request
@@ -205,6 +261,13 @@ class A2PA2AAdapter:
             A2PContext that can be attached to A2A messages
         """
         requested_scopes = scopes or self.default_scopes
+        key = (user_did, tuple(sorted(requested_scopes)))
+
+        cached = self._loaded_contexts.get(key)
+        if cached and self._is_fresh(cached):
+            self._loaded_contexts.move_to_end(key)
+            self._latest_keys[user_did] = key
+            return cached[0]
 
         profile = await self.client.get_profile(
             user_did=user_did,
@@ -212,10 +275,20 @@ class A2PA2AAdapter:
         )
 
         context = self._profile_to_context(user_did, profile, requested_scopes)
-        self._loaded_contexts[user_did] = context
+        self._loaded_contexts[key] = (context, time.monotonic())
+        self._loaded_contexts.move_to_end(key)
+        self._latest_keys[user_did] = key
+        while len(self._loaded_contexts) > self.cache_config.max_entries:
+            evicted, _ = self._loaded_contexts.popitem(last=False)
+            if self._latest_keys.get(evicted[0]) == evicted:
+                del self._latest_keys[evicted[0]]
 
         return context
 
+    def _is_fresh(self, entry: Tuple[A2PContext, float]) -> bool:
+        """Check whether a cached context is still within its TTL."""
+        return time.monotonic() - entry[1] < self.cache_config.ttl_seconds
+
     def _profile_to_context(
         self,
         user_did: str,
@@ -357,10 +430,9 @@ class A2PA2AAdapter:
         Returns:
             Preference value if set, None otherwise
         """
-        keys = preference_key.split(".")
         value = context.preferences
 
-        for key in keys:
+        for key in _compile_path(preference_key):
             if isinstance(value, dict):
                 value = value.get(key)
             else:
@@ -386,8 +458,18 @@ class A2PA2AAdapter:
         return context.constraints.get(constraint_key)
 
     def get_cached_context(self, user_did: str) -> Optional[A2PContext]:
-        """Get cached context for a user."""
-        return self._loaded_contexts.get(user_did)
+        """Get the most recently used, unexpired cached context for a user."""
+        key = self._latest_keys.get(user_did)
+        entry = self._loaded_contexts.get(key) if key else None
+        if entry and self._is_fresh(entry):
+            return entry[0]
+        return None
+
+    def invalidate(self, user_did: str) -> None:
+        """Drop every cached context for a user, e.g. after their profile changes."""
+        for key in [key for key in self._loaded_contexts if key[0] == user_did]:
+            del self._loaded_contexts[key]
+        self._latest_keys.pop(user_did, None)
 
 
 class A2AAgentWithA2P:
@@ -478,6 +560,7 @@ def create_a2a_adapter(
 __all__ = [
     "A2PA2AAdapter",
     "A2PContext",
+    "CacheConfig",
     "A2AMessage",
     "A2AMessageType",
     "A2AAgentWithA2P",
@@ -24,6 +24,7 @@ from a2p.core.consent import (
     revoke_consent,
 )
 from a2p.core.profile import (
+    add_consent_policy,
     add_memory,
     add_policy,
     add_sub_profile,
@@ -54,6 +55,7 @@ from a2p.core.proposal import (
     reject_proposal,
     withdraw_proposal,
 )
+from a2p.storage.batching import AsyncBatchingStorage
 from a2p.storage.cloud import CloudStorage
 from a2p.storage.memory import MemoryStorage
 from a2p.storage.solid import SolidStorage
@@ -171,6 +173,7 @@ __all__ = [
     "MemoryStorage",
     "CloudStorage",
     "SolidStorage",
+    "AsyncBatchingStorage",
     # Profile
     "create_profile",
     "update_identity",
@@ -183,6 +186,7 @@ __all__ = [
     "update_sub_profile",
     "remove_sub_profile",
     "add_policy",
+    "add_consent_policy",
     "update_policy",
     "remove_policy",
     "get_filtered_profile",
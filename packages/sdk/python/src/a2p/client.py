@@ -4,7 +4,9 @@ a2p Client
 Main client for interacting with the a2p protocol.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from datetime import datetime, timezone
 from typing import Any
 
@@ -31,6 +33,7 @@ from a2p.types import (
     AgentProfile,
     Memory,
     MemorySource,
+    MemorySourceType,
     MemoryStatus,
     PermissionLevel,
     Profile,
@@ -39,6 +42,9 @@ from a2p.types import (
 )
 from a2p.utils.id import generate_session_id
 
+# Proposals sent at once by A2PClient.propose_memories to a remote endpoint
+MAX_CONCURRENT_PROPOSALS = 8
+
 
 class ProfileStorage(ABC):
     """Abstract base class for profile storage"""
@@ -49,8 +55,13 @@ class ProfileStorage(ABC):
         ...
 
     @abstractmethod
-    async def set(self, did: str, profile: Profile) -> None:
-        """Store a profile"""
+    async def set(self, did: str, profile: Profile) -> int | None:
+        """
+        Store a profile
+
+        Backends that track revisions return the revision this write was
+        stored at (see ``get_revision``); others return None.
+        """
         ...
 
     @abstractmethod
@@ -58,6 +69,20 @@ class ProfileStorage(ABC):
         """Delete a profile"""
         ...
 
+    async def set_many(self, profiles: Mapping[str, Profile]) -> None:
+        """Store several profiles (backends may override with a single write)"""
+        for did, profile in profiles.items():
+            await self.set(did, profile)
+
+    async def get_revision(self, did: str) -> int | None:
+        """
+        Get a counter that changes whenever the stored profile changes
+
+        Returns None when the backend cannot tell, in which case callers
+        must re-read the profile.
+        """
+        return None
+
 
 # MemoryStorage moved to a2p.storage.memory
 # Import here for backward compatibility
@@ -238,6 +263,84 @@ class A2PClient:
             "status": proposal.status.value,
         }
 
+    async def propose_memories(
+        self,
+        user_did: str,
+        proposals: list[dict[str, Any]],
+        max_concurrency: int = MAX_CONCURRENT_PROPOSALS,
+    ) -> list[dict[str, Any] | BaseException]:
+        """
+        Propose several memories to a user's profile
+
+        Each entry takes the keyword arguments of ``propose_memory``. With a
+        local storage backend the profile is read and written once for the
+        whole batch, and any error fails the batch. Backends with their own
+        ``propose_memory`` endpoint receive the proposals concurrently, at
+        most ``max_concurrency`` at a time; a proposal the backend rejects
+        is returned as its exception in place of a result, so the others
+        still report theirs.
+        """
+        for entry in proposals:
+            memory_type = entry.get("memory_type", "episodic")
+            if memory_type not in ("episodic", "semantic", "procedural"):
+                raise ValueError(
+                    f"Invalid memory_type: {memory_type}. "
+                    f"Must be one of: episodic, semantic, procedural"
+                )
+
+        if hasattr(self.storage, "propose_memory"):
+            limit = asyncio.Semaphore(max_concurrency)
+
+            async def propose(entry: dict[str, Any]) -> dict[str, Any]:
+                async with limit:
+                    return await self.propose_memory(user_did=user_did, **entry)
+
+            return list(
+                await asyncio.gather(
+                    *(propose(entry) for entry in proposals), return_exceptions=True
+                )
+            )
+
+        profile = await self.storage.get(user_did)
+
+        if not profile:
+            raise ValueError(f"Profile not found: {user_did}")
+
+        results: list[dict[str, Any] | BaseException] = []
+        for entry in proposals:
+            category = entry.get("category")
+            access_result = evaluate_access(
+                profile,
+                self.agent_did,
+                [category or "a2p:episodic"],
+                self.agent_profile,
+            )
+
+            if not has_permission(access_result["permissions"], PermissionLevel.PROPOSE):
+                raise PermissionError("Access denied: Agent does not have propose permission")
+
+            proposal = create_proposal(
+                agent_did=self.agent_did,
+                agent_name=(self.agent_profile.identity.name if self.agent_profile else None),
+                session_id=self.session_id,
+                content=entry["content"],
+                category=category,
+                confidence=entry.get("confidence", 0.7),
+                context=entry.get("context"),
+                suggested_sensitivity=entry.get("suggested_sensitivity"),
+            )
+            profile = add_proposal(profile, proposal)
+            results.append(
+                {
+                    "proposal_id": proposal.id,
+                    "status": proposal.status.value,
+                }
+            )
+
+        await self.storage.set(user_did, profile)
+
+        return results
+
     async def check_permission(
         self,
         user_did: str,
@@ -280,6 +383,10 @@ class A2PUserClient:
     def __init__(self, storage: ProfileStorage | None = None) -> None:
         self.storage = storage or MemoryStorage()
         self.profile: Profile | None = None
+        # Storage revision and a private copy of the profile as last read or
+        # written there; cleared before every write so a failed one leaves
+        # nothing to reuse
+        self._stored: tuple[int, Profile] | None = None
 
     async def create_profile(
         self,
@@ -287,12 +394,26 @@ class A2PUserClient:
     ) -> Profile:
         """Create a new profile"""
         self.profile = create_profile(display_name=display_name)
-        await self.storage.set(self.profile.id, self.profile)
+        await self.save_profile()
         return self.profile
 
     async def load_profile(self, did: str) -> Profile | None:
-        """Load an existing profile"""
+        """
+        Load an existing profile
+
+        Skips the read when the storage reports the same revision as the
+        last read or write of this DID; the profile is then rebuilt from a
+        copy taken at that point, so unsaved changes are discarded either way.
+        """
+        rev = await self.storage.get_revision(did)
+        stored = self._stored
+        if rev is not None and stored is not None and stored[0] == rev and stored[1].id == did:
+            self.profile = stored[1].model_copy(deep=True)
+            return self.profile
+        self._stored = None
         self.profile = await self.storage.get(did)
+        if rev is not None and self.profile is not None:
+            self._stored = (rev, self.profile.model_copy(deep=True))
         return self.profile
 
     def get_profile(self) -> Profile | None:
@@ -303,7 +424,12 @@ class A2PUserClient:
         """Save the current profile"""
         if not self.profile:
             raise ValueError("No profile loaded")
-        await self.storage.set(self.profile.id, self.profile)
+        self._stored = None
+        # The revision comes from the write itself, so a write by someone
+        # else right after it cannot be mistaken for ours
+        rev = await self.storage.set(self.profile.id, self.profile)
+        if rev is not None:
+            self._stored = (rev, self.profile.model_copy(deep=True))
 
     async def add_memory(
         self,
@@ -325,7 +451,7 @@ class A2PUserClient:
             scope=scope,
             tags=tags,
             source=MemorySource(
-                type="user_manual",
+                type=MemorySourceType.USER_MANUAL,
                 timestamp=datetime.now(timezone.utc),
             ),
             status=MemoryStatus.APPROVED,
@@ -336,6 +462,33 @@ class A2PUserClient:
         episodic = self.profile.memories.episodic if self.profile.memories else []
         return episodic[-1] if episodic else None
 
+    async def add_memories(self, memories: list[dict[str, Any]]) -> list[Memory]:
+        """
+        Add several memories manually with a single save
+
+        Each entry takes the keyword arguments of ``add_memory``.
+        """
+        if not self.profile:
+            raise ValueError("No profile loaded")
+
+        profile = self.profile
+        for entry in memories:
+            profile = add_memory(
+                profile,
+                **entry,
+                source=MemorySource(
+                    type=MemorySourceType.USER_MANUAL,
+                    timestamp=datetime.now(timezone.utc),
+                ),
+                status=MemoryStatus.APPROVED,
+                confidence=1.0,
+            )
+        self.profile = profile
+        await self.save_profile()
+
+        episodic = self.profile.memories.episodic if self.profile.memories else []
+        return list(episodic[len(episodic) - len(memories) :]) if episodic else []
+
     def get_pending_proposals(self) -> list[Proposal]:
         """Get pending proposals"""
         if not self.profile:
@@ -373,6 +526,43 @@ class A2PUserClient:
         self.profile = reject_proposal(self.profile, proposal_id, reason)
         await self.save_profile()
 
+    async def approve_proposals(self, proposal_ids: list[str]) -> list[Memory]:
+        """
+        Approve several proposals with a single save
+
+        If any proposal cannot be approved, nothing is applied or saved.
+        """
+        if not self.profile:
+            raise ValueError("No profile loaded")
+
+        profile = self.profile
+        memories = []
+        for proposal_id in proposal_ids:
+            profile, memory = approve_proposal(profile, proposal_id)
+            memories.append(memory)
+        self.profile = profile
+        await self.save_profile()
+        return memories
+
+    async def reject_proposals(
+        self,
+        proposal_ids: list[str],
+        reason: str | None = None,
+    ) -> None:
+        """
+        Reject several proposals with a single save
+
+        If any proposal cannot be rejected, nothing is applied or saved.
+        """
+        if not self.profile:
+            raise ValueError("No profile loaded")
+
+        profile = self.profile
+        for proposal_id in proposal_ids:
+            profile = reject_proposal(profile, proposal_id, reason)
+        self.profile = profile
+        await self.save_profile()
+
     def export_profile(self) -> str:
         """Export profile to JSON"""
         if not self.profile:
@@ -12,6 +12,7 @@ from a2p.core.consent import (
     revoke_consent,
 )
 from a2p.core.profile import (
+    add_consent_policy,
     add_memory,
     add_policy,
     add_sub_profile,
@@ -56,6 +57,7 @@ __all__ = [
     "update_sub_profile",
     "remove_sub_profile",
     "add_policy",
+    "add_consent_policy",
     "update_policy",
     "remove_policy",
     "get_filtered_profile",
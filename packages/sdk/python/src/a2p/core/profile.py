@@ -302,13 +302,22 @@ def add_policy(
         **kwargs,
     )
 
+    return add_consent_policy(profile, policy)
+
+
+def add_consent_policy(profile: Profile, policy: ConsentPolicy) -> Profile:
+    """Add an already-constructed consent policy
+
+    Lets callers build a policy once (e.g. at import time) and attach it to
+    many profiles without re-validating its fields each time.
+    """
     policies = list(profile.access_policies or [])
     policies.append(policy)
 
     return profile.model_copy(
         update={
             "access_policies": policies,
-            "updated": now,
+            "updated": datetime.now(timezone.utc),
         }
     )
 
@@ -4,8 +4,9 @@ a2p Storage Backends
 This module provides storage implementations for the a2p SDK.
 """
 
+from a2p.storage.batching import AsyncBatchingStorage
 from a2p.storage.cloud import CloudStorage
 from a2p.storage.memory import MemoryStorage
 from a2p.storage.solid import SolidStorage
 
-__all__ = ["CloudStorage", "MemoryStorage", "SolidStorage"]
+__all__ = ["AsyncBatchingStorage", "CloudStorage", "MemoryStorage", "SolidStorage"]
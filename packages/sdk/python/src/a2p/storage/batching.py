@@ -0,0 +1,164 @@
+"""
+Write-batching storage wrapper for a2p profiles.
+
+Coalesces profile writes that arrive within a short window into a single
+``set_many`` call on the wrapped backend.
+"""
+
+import asyncio
+from contextlib import suppress
+from types import TracebackType
+from typing import Any
+
+from a2p.client import ProfileStorage
+from a2p.types import Profile
+
+
+class AsyncBatchingStorage(ProfileStorage):
+    """
+    Storage wrapper that batches concurrent writes.
+
+    While started, ``set`` enqueues the write and waits until a background
+    worker has committed it. The worker takes up to ``max_batch`` queued
+    writes and commits them with one ``set_many`` call. It keeps collecting
+    only while more writes keep arriving, for at most ``max_delay`` seconds,
+    so a lone write (e.g. from a caller awaiting each ``set`` in turn) is
+    committed straight away. When the worker is not running, writes go
+    straight to the wrapped storage.
+
+    Any other attribute, such as a backend's ``propose_memory`` endpoint,
+    is looked up on the wrapped storage.
+
+    Example:
+        ```python
+        async with AsyncBatchingStorage(MemoryStorage()) as storage:
+            client = A2PUserClient(storage)
+            ...
+        ```
+    """
+
+    def __init__(
+        self,
+        storage: ProfileStorage,
+        max_batch: int = 64,
+        max_delay: float = 0.001,
+    ) -> None:
+        """
+        Initialize the batching wrapper.
+
+        Args:
+            storage: Backend that receives the batched writes
+            max_batch: Maximum number of writes committed per batch
+            max_delay: Maximum time in seconds to wait for a batch to fill
+        """
+        self.storage = storage
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue[tuple[str, Profile, asyncio.Future[None]]] | None = None
+        self._pending: dict[str, Profile] = {}
+        self._worker: asyncio.Task[None] | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes the wrapper lacks; guard against lookups
+        # before __init__ has set the wrapped storage
+        if name == "storage":
+            raise AttributeError(name)
+        return getattr(self.storage, name)
+
+    async def __aenter__(self) -> "AsyncBatchingStorage":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """Start the background batching worker"""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Commit queued writes and stop the background worker"""
+        if self._worker is None or self._queue is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._worker
+        self._worker = None
+        self._queue = None
+
+    async def get(self, did: str) -> Profile | None:
+        """Get a profile by DID, including writes not yet committed"""
+        if did in self._pending:
+            return self._pending[did]
+        return await self.storage.get(did)
+
+    async def set(self, did: str, profile: Profile) -> int | None:
+        """
+        Store a profile, returning once its batch has been committed
+
+        Returns the backend's revision when the write is not batched, None
+        when it went out as part of a batch.
+        """
+        if self._queue is None:
+            return await self.storage.set(did, profile)
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending[did] = profile
+        self._queue.put_nowait((did, profile, future))
+        await future
+        return None
+
+    async def get_revision(self, did: str) -> int | None:
+        """Get the backend revision, or None while a write is still queued"""
+        if did in self._pending:
+            return None
+        return await self.storage.get_revision(did)
+
+    async def delete(self, did: str) -> None:
+        """Delete a profile once all queued writes have been committed"""
+        if self._queue is not None:
+            await self._queue.join()
+        await self.storage.delete(did)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_delay
+            # Let writers that are ready to run enqueue, and stop as soon as
+            # a pass brings nothing new
+            while len(batch) < self.max_batch and loop.time() < deadline:
+                await asyncio.sleep(0)
+                if queue.empty():
+                    break
+                while len(batch) < self.max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+            # Later writes to the same DID win, as they would with sequential sets
+            profiles = {did: profile for did, profile, _ in batch}
+            try:
+                await self.storage.set_many(profiles)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+            finally:
+                for did, profile, _ in batch:
+                    if self._pending.get(did) is profile:
+                        del self._pending[did]
+                    queue.task_done()
@@ -5,6 +5,7 @@ This storage backend connects to a2p-compatible REST APIs (like a2p-cloud)
 via HTTP/REST to store and retrieve profiles.
 """
 
+from importlib.util import find_spec
 from typing import Any
 
 import httpx
@@ -12,6 +13,16 @@ import httpx
 from a2p.client import ProfileStorage
 from a2p.types import Profile
 
+# Keep-alive pool shared by every request of a CloudStorage instance
+DEFAULT_LIMITS = httpx.Limits(
+    max_keepalive_connections=16,
+    max_connections=32,
+    keepalive_expiry=60.0,
+)
+
+# HTTP/2 needs the optional h2 package (installed with the "fast" extra)
+_HAS_H2 = find_spec("h2") is not None
+
 
 class CloudStorage(ProfileStorage):
     """
@@ -41,6 +52,9 @@ class CloudStorage(ProfileStorage):
         agent_did: str | None = None,
         timeout: float = 30.0,
         api_version: str = "v1",
+        limits: httpx.Limits | None = None,
+        http2: bool | None = None,
+        client: httpx.AsyncClient | None = None,
     ):
         """
         Initialize cloud storage backend.
@@ -51,6 +65,14 @@ class CloudStorage(ProfileStorage):
             agent_did: Optional agent DID for identification
             timeout: HTTP request timeout in seconds
             api_version: API version to use (default: "v1")
+            limits: Connection pool limits (default: DEFAULT_LIMITS). Connections
+                are kept alive and reused across requests until close().
+            http2: Use HTTP/2. Defaults to enabled when the h2 package is installed.
+            client: Existing HTTP client to send requests through, e.g. to share
+                one connection pool between the storages of several agents.
+                Authentication and agent headers are then sent with each
+                request, limits and http2 are ignored, and close() leaves the
+                client open.
         """
         self.api_url = api_url.rstrip("/")
         self.auth_token = auth_token
@@ -67,10 +89,56 @@ class CloudStorage(ProfileStorage):
         if agent_did:
             headers["A2P-Agent-DID"] = agent_did
 
-        self._client = httpx.AsyncClient(
-            timeout=timeout,
-            headers=headers,
-        )
+        if client is None:
+            self._client = httpx.AsyncClient(
+                timeout=timeout,
+                headers=headers,
+                limits=limits or DEFAULT_LIMITS,
+                http2=_HAS_H2 if http2 is None else http2,
+            )
+            self._owns_client = True
+            self._request_headers: dict[str, str] | None = None
+        else:
+            self._client = client
+            self._owns_client = False
+            self._request_headers = headers
+
+        # ETag and profile of the last response per profile URL, so repeat
+        # reads can be answered with 304 Not Modified. The profile is a
+        # private copy; callers always get their own.
+        self._etag_cache: dict[str, tuple[str, Profile]] = {}
+
+    def _profile_url(self, did: str, scopes: list[str] | None = None) -> str:
+        url = f"{self.api_url}/a2p/{self.api_version}/profile/{did}"
+        if scopes:
+            scopes_param = ",".join(scopes)
+            url += f"?scopes={scopes_param}"
+        return url
+
+    def _request_options(self, headers: dict[str, str] | None = None) -> dict[str, Any]:
+        """Per-request keyword arguments; a shared client needs this storage's headers"""
+        if self._request_headers is None:
+            return {"headers": headers} if headers else {}
+        return {
+            "headers": {**self._request_headers, **headers} if headers else self._request_headers,
+            "timeout": self.timeout,
+        }
+
+    def _forget(self, did: str) -> None:
+        base = self._profile_url(did)
+        for url in [u for u in self._etag_cache if u == base or u.startswith(base + "?")]:
+            del self._etag_cache[url]
+
+    def get_etag(self, did: str, scopes: list[str] | None = None) -> str | None:
+        """
+        Get the ETag of the last profile read for a DID and scopes.
+
+        Returns:
+            The ETag sent by the API, or None if the profile was not read yet
+            or the API sent no ETag
+        """
+        cached = self._etag_cache.get(self._profile_url(did, scopes))
+        return cached[0] if cached else None
 
     async def get(self, did: str, scopes: list[str] | None = None) -> Profile | None:
         """
@@ -82,28 +150,43 @@ class CloudStorage(ProfileStorage):
                    If None, no scopes are requested and only minimal profile metadata is returned.
 
         Returns:
-            Profile if found, None if not found
+            Profile if found, None if not found. If the API answers a repeat
+            read with 304 Not Modified, a copy of the profile from the
+            previous read is returned, without any changes made to it since.
 
         Raises:
             httpx.HTTPError: On HTTP errors
         """
         try:
-            url = f"{self.api_url}/a2p/{self.api_version}/profile/{did}"
-            if scopes:
-                scopes_param = ",".join(scopes)
-                url += f"?scopes={scopes_param}"
+            url = self._profile_url(did, scopes)
+
+            cached = self._etag_cache.get(url)
+            if cached is None:
+                response = await self._client.get(url, **self._request_options())
+            else:
+                response = await self._client.get(
+                    url, **self._request_options({"If-None-Match": cached[0]})
+                )
+                if response.status_code == 304:
+                    return cached[1].model_copy(deep=True)
 
-            response = await self._client.get(url)
             if response.status_code == 404:
+                self._etag_cache.pop(url, None)
                 return None
             response.raise_for_status()
             data = response.json()
 
             # Handle API response format: { success: true, data: {...}, meta: {...} }
             profile_data = data.get("data", data)
-            return self._deserialize_profile(profile_data)
+            profile = self._deserialize_profile(profile_data)
+
+            etag = response.headers.get("ETag")
+            if etag:
+                self._etag_cache[url] = (etag, profile.model_copy(deep=True))
+            return profile
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
+                self._etag_cache.pop(url, None)
                 return None
             raise
         except httpx.RequestError as e:
@@ -124,7 +207,10 @@ class CloudStorage(ProfileStorage):
             httpx.HTTPError: On HTTP errors
         """
         payload = self._serialize_profile(profile)
-        response = await self._client.put(f"{self.api_url}/api/profiles/{did}", json=payload)
+        self._forget(did)
+        response = await self._client.put(
+            f"{self.api_url}/api/profiles/{did}", json=payload, **self._request_options()
+        )
         response.raise_for_status()
 
     async def delete(self, did: str) -> None:
@@ -137,7 +223,10 @@ class CloudStorage(ProfileStorage):
         Raises:
             httpx.HTTPError: On HTTP errors
         """
-        response = await self._client.delete(f"{self.api_url}/api/profiles/{did}")
+        self._forget(did)
+        response = await self._client.delete(
+            f"{self.api_url}/api/profiles/{did}", **self._request_options()
+        )
         response.raise_for_status()
 
     async def propose_memory(
@@ -191,6 +280,7 @@ class CloudStorage(ProfileStorage):
         response = await self._client.post(
             f"{self.api_url}/a2p/{self.api_version}/profile/{user_did}/memories/propose",
             json=payload,
+            **self._request_options(),
         )
         response.raise_for_status()
 
@@ -205,7 +295,8 @@ class CloudStorage(ProfileStorage):
 
     async def close(self) -> None:
         """Close HTTP client and cleanup resources."""
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
     def _serialize_profile(self, profile: Profile) -> dict:
         """
@@ -5,24 +5,54 @@ This is a simple storage backend that stores profiles in memory.
 Useful for testing and local development.
 """
 
+from collections.abc import Mapping
+
 from a2p.client import ProfileStorage
 from a2p.types import Profile
 
 
 class MemoryStorage(ProfileStorage):
-    """In-memory storage implementation"""
+    """
+    In-memory storage implementation
+
+    Profiles live in a plain dict and no operation awaits anything, so
+    coroutines sharing one event loop never interleave inside a call and
+    no lock is taken. Instances are not safe to share across threads.
+
+    Every write stamps the DID with a new store-wide revision number,
+    reported by ``get_revision``.
+    """
 
     def __init__(self) -> None:
         self._profiles: dict[str, Profile] = {}
+        self._revisions: dict[str, int] = {}
+        self._next_rev = 0
+
+    def _bump(self, did: str) -> int:
+        self._next_rev += 1
+        self._revisions[did] = self._next_rev
+        return self._next_rev
 
     async def get(self, did: str) -> Profile | None:
         """Get a profile by DID"""
         return self._profiles.get(did)
 
-    async def set(self, did: str, profile: Profile) -> None:
-        """Store a profile"""
+    async def set(self, did: str, profile: Profile) -> int:
+        """Store a profile, returning its new revision"""
         self._profiles[did] = profile
+        return self._bump(did)
+
+    async def set_many(self, profiles: Mapping[str, Profile]) -> None:
+        """Store several profiles in a single update"""
+        self._profiles.update(profiles)
+        for did in profiles:
+            self._bump(did)
 
     async def delete(self, did: str) -> None:
         """Delete a profile"""
         self._profiles.pop(did, None)
+        self._bump(did)
+
+    async def get_revision(self, did: str) -> int | None:
+        """Get the revision of a stored profile (0 if never written)"""
+        return self._revisions.get(did, 0)
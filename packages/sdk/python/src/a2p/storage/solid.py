@@ -22,13 +22,37 @@ Example:
 """
 
 import json
+from collections.abc import Callable
+from typing import Any
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None  # type: ignore[assignment]
+
 from a2p.client import ProfileStorage
 from a2p.types import Profile
 
 
+def _stdlib_dumps(data: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Encode the Pod document as indented JSON with the stdlib encoder"""
+    return json.dumps(data, indent=2, ensure_ascii=False, default=default).encode()
+
+
+def _orjson_dumps(data: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Encode the Pod document as indented JSON with orjson, matching _stdlib_dumps"""
+    # Route datetimes and dataclasses through ``default`` like the stdlib does
+    option = (
+        orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+    return orjson.dumps(data, default=default, option=option)
+
+
+_dumps = _orjson_dumps if orjson is not None else _stdlib_dumps
+
+
 class SolidStorage(ProfileStorage):
     """
     Solid Pod storage backend for a2p profiles.
@@ -160,7 +184,7 @@ class SolidStorage(ProfileStorage):
                 response = await client.put(
                     self.profile_path,
                     headers=self._get_headers(),
-                    content=json.dumps(data, indent=2, default=str),
+                    content=_dumps(data, default=str),
                 )
 
                 response.raise_for_status()
@@ -212,7 +236,7 @@ class SolidStorage(ProfileStorage):
                         response = await client.put(
                             self.profile_path,
                             headers=self._get_headers(),
-                            content=json.dumps(data, indent=2),
+                            content=_dumps(data),
                         )
 
                     response.raise_for_status()
@@ -1,5 +1,7 @@
 """Tests for a2p clients"""
 
+import asyncio
+
 import pytest
 
 from a2p.client import (
@@ -16,6 +18,45 @@ from a2p.types import (
 )
 
 
+class CountingStorage(MemoryStorage):
+    """Memory storage that counts profile reads and writes"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+        self.reads = 0
+        self.fail_writes = False
+
+    async def get(self, did):
+        self.reads += 1
+        return await super().get(did)
+
+    async def set(self, did, profile):
+        if self.fail_writes:
+            raise ConnectionError("Storage unavailable")
+        self.writes += 1
+        return await super().set(did, profile)
+
+
+class ProposingStorage(MemoryStorage):
+    """Memory storage with a remote-style propose endpoint that tracks concurrency"""
+
+    def __init__(self, rejected: frozenset[str] = frozenset()) -> None:
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+        self.rejected = rejected
+
+    async def propose_memory(self, user_did, content, **kwargs):
+        if content in self.rejected:
+            raise PermissionError(f"Rejected: {content}")
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        return {"proposal_id": content, "status": "pending"}
+
+
 class TestMemoryStorage:
     """Test memory storage implementation"""
 
@@ -81,6 +122,75 @@ class TestA2PUserClient:
         assert memory.content == "User likes Python"
         assert memory.status == MemoryStatus.APPROVED
 
+    @pytest.mark.asyncio
+    async def test_load_profile_skips_unchanged(self):
+        """Test reloading an unchanged profile does not read storage"""
+        storage = CountingStorage()
+        client = A2PUserClient(storage)
+        profile = await client.create_profile()
+
+        assert await client.load_profile(profile.id) == profile
+        assert storage.reads == 0
+
+        # A write by anyone else bumps the revision and forces a read
+        await storage.set(profile.id, profile.model_copy())
+        reloaded = await client.load_profile(profile.id)
+        assert reloaded is not profile
+        assert storage.reads == 1
+
+    @pytest.mark.asyncio
+    async def test_load_profile_discards_unsaved_changes(self):
+        """Test reloading an unchanged profile drops edits that were never saved"""
+        storage = CountingStorage()
+        client = A2PUserClient(storage)
+        profile = await client.create_profile(display_name="Alice")
+
+        profile.identity.display_name = "Unsaved"
+        reloaded = await client.load_profile(profile.id)
+
+        assert reloaded.identity.display_name == "Alice"
+        assert storage.reads == 0
+
+    @pytest.mark.asyncio
+    async def test_load_profile_after_failed_save(self):
+        """Test a failed save makes the next load read storage"""
+        storage = CountingStorage()
+        client = A2PUserClient(storage)
+        profile = await client.create_profile()
+
+        storage.fail_writes = True
+        with pytest.raises(ConnectionError):
+            await client.add_memory(content="User likes Python")
+
+        await client.load_profile(profile.id)
+        assert storage.reads == 1
+
+    @pytest.mark.asyncio
+    async def test_add_memories_saves_once(self):
+        """Test adding several memories writes the profile once"""
+        storage = CountingStorage()
+        client = A2PUserClient(storage)
+        await client.create_profile()
+        storage.writes = 0
+
+        await client.add_memories(
+            [
+                {"content": "User likes Python", "category": "a2p:preferences"},
+                {"content": "User likes Rust", "category": "a2p:preferences"},
+            ]
+        )
+
+        assert storage.writes == 1
+        assert await storage.get(client.get_profile().id) is client.get_profile()
+
+    @pytest.mark.asyncio
+    async def test_add_memories_without_profile(self):
+        """Test adding memories requires a loaded profile"""
+        client = A2PUserClient()
+
+        with pytest.raises(ValueError, match="No profile loaded"):
+            await client.add_memories([{"content": "Test"}])
+
     @pytest.mark.asyncio
     async def test_get_pending_proposals(self):
         """Test getting pending proposals"""
@@ -175,6 +285,51 @@ class TestA2PUserClient:
         proposals = client.get_pending_proposals()
         assert len(proposals) == 0
 
+    @pytest.mark.asyncio
+    async def test_approve_and_reject_proposals(self):
+        """Test resolving several proposals writes the profile once per batch"""
+        storage = CountingStorage()
+        client = A2PUserClient(storage)
+        await client.create_profile()
+        user_did = client.get_profile().id
+        client.profile = add_policy(
+            client.get_profile(),
+            agent_pattern="did:a2p:agent:*",
+            permissions=[PermissionLevel.PROPOSE],
+            allow=["a2p:preferences.*"],
+        )
+        await client.save_profile()
+
+        agent_client = A2PClient("did:a2p:agent:test", storage=storage)
+        results = await agent_client.propose_memories(
+            user_did,
+            [{"content": f"Proposal {i}", "category": "a2p:preferences"} for i in range(3)],
+        )
+        ids = [r["proposal_id"] for r in results]
+        await client.load_profile(user_did)
+        storage.writes = 0
+
+        memories = await client.approve_proposals(ids[:2])
+        assert [m.content for m in memories] == ["Proposal 0", "Proposal 1"]
+        assert storage.writes == 1
+
+        await client.reject_proposals(ids[2:], reason="Not relevant")
+        assert storage.writes == 2
+        assert client.get_pending_proposals() == []
+
+    @pytest.mark.asyncio
+    async def test_approve_proposals_unknown_id(self):
+        """Test a failing batch approval leaves the profile untouched"""
+        storage = CountingStorage()
+        client = A2PUserClient(storage)
+        profile = await client.create_profile()
+        storage.writes = 0
+
+        with pytest.raises(ValueError, match="Proposal not found"):
+            await client.approve_proposals(["prop_missing"])
+        assert client.get_profile() is profile
+        assert storage.writes == 0
+
     @pytest.mark.asyncio
     async def test_export_import_profile(self):
         """Test exporting and importing profile"""
@@ -296,6 +451,87 @@ class TestA2PClient:
         assert "proposal_id" in result
         assert result["status"] == "pending"
 
+    @pytest.mark.asyncio
+    async def test_propose_memories(self):
+        """Test proposing several memories with one profile write"""
+        storage = CountingStorage()
+        user_client = A2PUserClient(storage)
+        await user_client.create_profile()
+        user_did = user_client.get_profile().id
+
+        profile = add_policy(
+            user_client.get_profile(),
+            agent_pattern="did:a2p:agent:*",
+            permissions=[PermissionLevel.PROPOSE],
+            allow=["a2p:preferences.*"],
+        )
+        await storage.set(user_did, profile)
+        storage.writes = 0
+
+        agent_client = A2PClient("did:a2p:agent:test", storage=storage)
+        results = await agent_client.propose_memories(
+            user_did,
+            [
+                {"content": "Likes tea", "category": "a2p:preferences", "confidence": 0.9},
+                {"content": "Likes jazz", "category": "a2p:preferences"},
+            ],
+        )
+
+        assert [r["status"] for r in results] == ["pending", "pending"]
+        assert storage.writes == 1
+
+        await user_client.load_profile(user_did)
+        proposals = user_client.get_pending_proposals()
+        assert [p.memory.content for p in proposals] == ["Likes tea", "Likes jazz"]
+        assert proposals[0].memory.confidence == 0.9
+
+    @pytest.mark.asyncio
+    async def test_propose_memories_no_permission(self):
+        """Test batch proposals fail without propose permission"""
+        storage = CountingStorage()
+        user_client = A2PUserClient(storage)
+        await user_client.create_profile()
+        user_did = user_client.get_profile().id
+        storage.writes = 0
+
+        agent_client = A2PClient("did:a2p:agent:test", storage=storage)
+
+        with pytest.raises(PermissionError, match="does not have propose permission"):
+            await agent_client.propose_memories(
+                user_did, [{"content": "Test", "category": "a2p:preferences"}]
+            )
+        assert storage.writes == 0
+
+    @pytest.mark.asyncio
+    async def test_propose_memories_bounded_concurrency(self):
+        """Test remote batch proposals respect max_concurrency and keep their order"""
+        storage = ProposingStorage()
+        agent_client = A2PClient("did:a2p:agent:test", storage=storage)
+
+        results = await agent_client.propose_memories(
+            "did:a2p:user:test",
+            [{"content": f"Memory {i}"} for i in range(5)],
+            max_concurrency=2,
+        )
+
+        assert [r["proposal_id"] for r in results] == [f"Memory {i}" for i in range(5)]
+        assert storage.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_propose_memories_partial_failure(self):
+        """Test a rejected remote proposal does not hide the others' results"""
+        storage = ProposingStorage(rejected=frozenset({"Memory 1"}))
+        agent_client = A2PClient("did:a2p:agent:test", storage=storage)
+
+        results = await agent_client.propose_memories(
+            "did:a2p:user:test",
+            [{"content": f"Memory {i}"} for i in range(3)],
+        )
+
+        assert isinstance(results[1], PermissionError)
+        assert results[0]["proposal_id"] == "Memory 0"
+        assert results[2]["proposal_id"] == "Memory 2"
+
     @pytest.mark.asyncio
     async def test_propose_memory_no_permission(self):
         """Test proposing memory without permission"""
@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 import pytest
 
 from a2p.core.profile import (
+    add_consent_policy,
     add_memory,
     add_policy,
     add_sub_profile,
@@ -24,6 +25,7 @@ from a2p.core.profile import (
 )
 from a2p.types import (
     CommonPreferences,
+    ConsentPolicy,
     MemorySource,
     MemoryStatus,
     ProfileType,
@@ -181,6 +183,21 @@ class TestPolicyManagement:
         assert policy.agent_pattern == "did:a2p:agent:*"
         assert "read" in policy.permissions
 
+    def test_add_consent_policy(self):
+        """Test adding a pre-built policy to several profiles"""
+        policy = ConsentPolicy(
+            id="policy_shared",
+            agentPattern="did:a2p:agent:*",
+            permissions=["read_scoped"],
+            allow=["a2p:preferences.*"],
+        )
+        first = add_consent_policy(create_profile(), policy)
+        second = add_consent_policy(create_profile(), policy)
+
+        assert first.access_policies == [policy]
+        assert second.access_policies == [policy]
+        assert first.updated is not None
+
     def test_update_policy(self):
         """Test updating a policy"""
         profile = create_profile()
@@ -0,0 +1,192 @@
+"""Tests for the write-batching storage wrapper"""
+
+import asyncio
+
+import pytest
+
+from a2p.core.profile import create_profile
+from a2p.storage.batching import AsyncBatchingStorage
+from a2p.storage.memory import MemoryStorage
+
+
+class CountingStorage(MemoryStorage):
+    """Memory storage that records how many batched writes it received"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+
+    async def set_many(self, profiles):
+        self.batches.append(len(profiles))
+        await super().set_many(profiles)
+
+
+class TestAsyncBatchingStorage:
+    """Test batching storage wrapper"""
+
+    @pytest.mark.asyncio
+    async def test_set_without_start_writes_through(self):
+        """Test writes go straight to the backend when not started"""
+        backend = CountingStorage()
+        storage = AsyncBatchingStorage(backend)
+        profile = create_profile()
+
+        await storage.set(profile.id, profile)
+
+        assert await backend.get(profile.id) is profile
+        assert backend.batches == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sets_are_batched(self):
+        """Test concurrent writes are committed in a single batch"""
+        backend = CountingStorage()
+        storage = AsyncBatchingStorage(backend, max_delay=0.05)
+        profiles = [create_profile() for _ in range(4)]
+
+        await storage.start()
+        try:
+            await asyncio.gather(*(storage.set(p.id, p) for p in profiles))
+        finally:
+            await storage.stop()
+
+        assert backend.batches == [4]
+        for profile in profiles:
+            assert await backend.get(profile.id) is profile
+
+    @pytest.mark.asyncio
+    async def test_max_batch_limits_batch_size(self):
+        """Test batches never exceed max_batch writes"""
+        backend = CountingStorage()
+        storage = AsyncBatchingStorage(backend, max_batch=2, max_delay=0.05)
+        profiles = [create_profile() for _ in range(5)]
+
+        await storage.start()
+        try:
+            await asyncio.gather(*(storage.set(p.id, p) for p in profiles))
+        finally:
+            await storage.stop()
+
+        assert backend.batches == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_last_write_wins_within_batch(self):
+        """Test repeated writes to one DID keep the latest profile"""
+        backend = CountingStorage()
+        storage = AsyncBatchingStorage(backend, max_delay=0.05)
+        first = create_profile()
+        second = first.model_copy()
+
+        await storage.start()
+        try:
+            await asyncio.gather(storage.set(first.id, first), storage.set(first.id, second))
+        finally:
+            await storage.stop()
+
+        assert await backend.get(first.id) is second
+
+    @pytest.mark.asyncio
+    async def test_get_sees_pending_write(self):
+        """Test reads observe writes that are queued but not committed"""
+        backend = CountingStorage()
+        storage = AsyncBatchingStorage(backend, max_delay=0.05)
+        profile = create_profile()
+
+        await storage.start()
+        try:
+            task = asyncio.create_task(storage.set(profile.id, profile))
+            await asyncio.sleep(0)
+            assert await backend.get(profile.id) is None
+            assert await storage.get(profile.id) is profile
+            await task
+        finally:
+            await storage.stop()
+
+    @pytest.mark.asyncio
+    async def test_revision_unknown_while_queued(self):
+        """Test the revision is withheld until a queued write is committed"""
+        backend = CountingStorage()
+        storage = AsyncBatchingStorage(backend, max_delay=0.05)
+        profile = create_profile()
+
+        await storage.start()
+        try:
+            task = asyncio.create_task(storage.set(profile.id, profile))
+            await asyncio.sleep(0)
+            assert await storage.get_revision(profile.id) is None
+            await task
+            assert await storage.get_revision(profile.id) == await backend.get_revision(profile.id)
+        finally:
+            await storage.stop()
+
+    @pytest.mark.asyncio
+    async def test_delete_after_queued_writes(self):
+        """Test delete waits for queued writes before removing the profile"""
+        backend = CountingStorage()
+        storage = AsyncBatchingStorage(backend, max_delay=0.05)
+        profile = create_profile()
+
+        await storage.start()
+        try:
+            task = asyncio.create_task(storage.set(profile.id, profile))
+            await asyncio.sleep(0)
+            await storage.delete(profile.id)
+            await task
+        finally:
+            await storage.stop()
+
+        assert await storage.get(profile.id) is None
+
+    @pytest.mark.asyncio
+    async def test_backend_error_propagates_to_writers(self):
+        """Test a failing batch raises in every waiting writer"""
+
+        class FailingStorage(MemoryStorage):
+            async def set_many(self, profiles):
+                raise RuntimeError("backend down")
+
+        storage = AsyncBatchingStorage(FailingStorage(), max_delay=0.05)
+        profiles = [create_profile() for _ in range(2)]
+
+        await storage.start()
+        try:
+            results = await asyncio.gather(
+                *(storage.set(p.id, p) for p in profiles), return_exceptions=True
+            )
+        finally:
+            await storage.stop()
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await storage.get(profiles[0].id) is None
+
+    @pytest.mark.asyncio
+    async def test_sequential_set_does_not_wait(self):
+        """Test a lone write is committed without waiting out max_delay"""
+        backend = CountingStorage()
+        profile = create_profile()
+
+        async with AsyncBatchingStorage(backend, max_delay=10.0) as storage:
+            await asyncio.wait_for(storage.set(profile.id, profile), timeout=1.0)
+
+        assert backend.batches == [1]
+
+    @pytest.mark.asyncio
+    async def test_context_manager_stops_on_error(self):
+        """Test leaving the context stops the worker even when a step fails"""
+        storage = AsyncBatchingStorage(CountingStorage())
+
+        with pytest.raises(RuntimeError):
+            async with storage:
+                raise RuntimeError("step failed")
+
+        assert storage._worker is None
+
+    def test_forwards_backend_endpoints(self):
+        """Test backend-only methods such as propose_memory are reachable"""
+
+        class ProposingStorage(MemoryStorage):
+            async def propose_memory(self, user_did, content, **kwargs):
+                return {"proposal_id": content}
+
+        backend = ProposingStorage()
+        assert AsyncBatchingStorage(backend).propose_memory == backend.propose_memory
+        assert not hasattr(AsyncBatchingStorage(MemoryStorage()), "propose_memory")
@@ -2,10 +2,11 @@
 
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
 from a2p.core.profile import create_profile
-from a2p.storage.cloud import CloudStorage
+from a2p.storage.cloud import DEFAULT_LIMITS, CloudStorage
 
 
 class TestCloudStorage:
@@ -62,6 +63,66 @@ class TestCloudStorage:
             call_args = mock_get.call_args
             assert "scopes=" in str(call_args)
 
+    @pytest.mark.asyncio
+    async def test_get_profile_not_modified(self):
+        """Test repeat reads send the ETag and reuse the profile on 304"""
+        storage = CloudStorage(api_url="https://api.example.com", auth_token="test-token")
+
+        profile = create_profile()
+        request = httpx.Request("GET", "https://api.example.com")
+        ok = httpx.Response(
+            200,
+            json={"success": True, "data": profile.model_dump(mode="json", by_alias=True)},
+            headers={"ETag": '"rev-1"'},
+            request=request,
+        )
+        not_modified = httpx.Response(304, request=request)
+
+        with patch.object(storage._client, "get") as mock_get:
+            mock_get.side_effect = [ok, not_modified]
+
+            first = await storage.get(profile.id)
+            second = await storage.get(profile.id)
+
+            assert first is not None
+            assert second == first
+            assert storage.get_etag(profile.id) == '"rev-1"'
+            assert "headers" not in mock_get.call_args_list[0].kwargs
+            assert mock_get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"rev-1"'}
+
+        with patch.object(storage._client, "put") as mock_put:
+            mock_put.return_value = AsyncMock(status_code=200, raise_for_status=lambda: None)
+
+            await storage.set(profile.id, profile)
+
+            assert storage.get_etag(profile.id) is None
+
+    @pytest.mark.asyncio
+    async def test_get_profile_not_modified_discards_local_changes(self):
+        """Test a 304 read returns the stored profile, not a caller's unsaved edits"""
+        profile = create_profile(display_name="Alice")
+        body = {"success": True, "data": profile.model_dump(mode="json", by_alias=True)}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.headers.get("If-None-Match") == '"rev-1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=body, headers={"ETag": '"rev-1"'})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        storage = CloudStorage(
+            api_url="https://api.example.com", auth_token="test-token", client=client
+        )
+
+        first = await storage.get(profile.id)
+        first.identity.display_name = "Unsaved"
+        second = await storage.get(profile.id)
+        second_again = await storage.get(profile.id)
+
+        assert second is not first
+        assert second.identity.display_name == "Alice"
+        assert second_again is not second
+        await client.aclose()
+
     @pytest.mark.asyncio
     async def test_set_profile(self):
         """Test setting profile via cloud API"""
@@ -139,6 +200,55 @@ class TestCloudStorage:
             assert result["id"] == "prop_123"
             mock_post.assert_called_once()
 
+    def test_connection_pool_config(self):
+        """Test the HTTP client is created with a keep-alive pool"""
+        with patch("a2p.storage.cloud.httpx.AsyncClient") as mock_client:
+            CloudStorage(api_url="https://api.example.com", auth_token="test-token")
+            assert mock_client.call_args.kwargs["limits"] is DEFAULT_LIMITS
+
+            limits = httpx.Limits(max_connections=4)
+            CloudStorage(
+                api_url="https://api.example.com",
+                auth_token="test-token",
+                limits=limits,
+                http2=False,
+            )
+            assert mock_client.call_args.kwargs["limits"] is limits
+            assert mock_client.call_args.kwargs["http2"] is False
+
+    @pytest.mark.asyncio
+    async def test_shared_client(self):
+        """Test storages sharing a client send their own headers and leave it open"""
+        client = httpx.AsyncClient()
+        research = CloudStorage(
+            api_url="https://api.example.com",
+            auth_token="test-token",
+            agent_did="did:a2p:agent:research",
+            client=client,
+        )
+        assistant = CloudStorage(
+            api_url="https://api.example.com",
+            auth_token="test-token",
+            agent_did="did:a2p:agent:assistant",
+            client=client,
+        )
+        assert research._client is assistant._client is client
+
+        with patch.object(client, "get") as mock_get:
+            mock_get.return_value = AsyncMock(status_code=404, raise_for_status=lambda: None)
+
+            await research.get("did:a2p:user:test:123")
+            await assistant.get("did:a2p:user:test:123")
+
+            first, second = mock_get.call_args_list
+            assert first.kwargs["headers"]["A2P-Agent-DID"] == "did:a2p:agent:research"
+            assert second.kwargs["headers"]["A2P-Agent-DID"] == "did:a2p:agent:assistant"
+            assert first.kwargs["headers"]["Authorization"] == "Bearer test-token"
+
+        await research.close()
+        assert not client.is_closed
+        await client.aclose()
+
     @pytest.mark.asyncio
     async def test_headers_included(self):
         """Test that authentication headers are included"""
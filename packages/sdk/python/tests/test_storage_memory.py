@@ -103,3 +103,31 @@ class TestMemoryStorage:
         # Profile should be in storage1
         result = await storage1.get(profile.id)
         assert result is not None
+
+    @pytest.mark.asyncio
+    async def test_set_many(self):
+        """Test storing several profiles in one call"""
+        storage = MemoryStorage()
+        profile1 = create_profile()
+        profile2 = create_profile()
+
+        await storage.set_many({profile1.id: profile1, profile2.id: profile2})
+
+        assert await storage.get(profile1.id) is profile1
+        assert await storage.get(profile2.id) is profile2
+
+    @pytest.mark.asyncio
+    async def test_get_revision(self):
+        """Test every write changes the profile's revision"""
+        storage = MemoryStorage()
+        profile = create_profile()
+        assert await storage.get_revision(profile.id) == 0
+
+        await storage.set(profile.id, profile)
+        first = await storage.get_revision(profile.id)
+        await storage.set_many({profile.id: profile})
+        second = await storage.get_revision(profile.id)
+        await storage.delete(profile.id)
+        third = await storage.get_revision(profile.id)
+
+        assert 0 < first < second < third
@@ -1,5 +1,6 @@
 """Tests for Solid storage backend"""
 
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -92,6 +93,10 @@ async def test_set_profile(solid_storage, sample_profile):
         call_args = mock_client_instance.put.call_args
         assert call_args[0][0] == solid_storage.profile_path
 
+        # Body round-trips whichever JSON encoder is installed
+        data = json.loads(call_args.kwargs["content"])
+        assert data[sample_profile.id]["id"] == sample_profile.id
+
 
 @pytest.mark.asyncio
 async def test_delete_profile(solid_storage, sample_profile):
@@ -175,3 +180,33 @@ def test_solid_storage_base_url_extraction():
     )
     assert storage2.base_url == "https://alice.inrupt.com"
     assert storage2.profile_path == "https://alice.inrupt.com/a2p/profile.json"
+
+
+def test_orjson_and_stdlib_encoders_match(sample_profile):
+    """Test the orjson and stdlib encoders write identical Pod documents."""
+    pytest.importorskip("orjson")
+    from datetime import datetime, timezone
+
+    from a2p.storage.solid import _orjson_dumps, _stdlib_dumps
+
+    sample_profile.identity.display_name = "Zoë 名前"
+    data = {
+        sample_profile.id: sample_profile.model_dump(by_alias=True),
+        "metadata": {"version": "0.1.0-alpha", "updated": datetime.now(timezone.utc)},
+        "empty": {"list": [], "dict": {}},
+    }
+
+    assert _orjson_dumps(data, default=str) == _stdlib_dumps(data, default=str)
+    assert _orjson_dumps({"a": [1, 0.5, None]}) == _stdlib_dumps({"a": [1, 0.5, None]})
+
+
+def test_encoders_reject_unknown_types_without_default():
+    """Test both encoders reject non-JSON values when no default is given."""
+    pytest.importorskip("orjson")
+    from datetime import datetime
+
+    from a2p.storage.solid import _orjson_dumps, _stdlib_dumps
+
+    for dumps in (_orjson_dumps, _stdlib_dumps):
+        with pytest.raises(TypeError):
+            dumps({"updated": datetime.now()})